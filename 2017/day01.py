@@ -8,25 +8,83 @@ See http://adventofcode.com/2017
 import sys
 sys.path.append('..')
 import helpers.puzzleInput
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+# Translation tables mapping the character of a digit on byte 1 and anything else on byte 0
+DIGIT_INDICATORS = [bytes(int(b == ord('0') + digit) for b in range(256)) for digit in range(10)]
 
 
 def captcha(input, dist=1):
-	'''Compute captcha with dist as distance between first and second digit'''
+	'''Compute captcha with dist as distance between first and second digit
+
+	input may be a str or bytes-like object of digits. Instead of looping
+	over the digits, input is compared with its rotation by dist at once,
+	with numpy if available.
+	'''
+	digits = input.encode('ascii') if isinstance(input, str) else bytes(input)
+	count = len(digits)
+	if 0 == count:
+		return 0
+	# Modulo count makes it wrap around
+	dist %= count
+	if numpy is not None:
+		values = numpy.frombuffer(digits, dtype=numpy.uint8) - ord('0')
+		return int(values[values == numpy.roll(values, -dist)].sum(dtype=numpy.int64))
+	rotated = digits[dist:] + digits[:dist]
 	result = 0
-	count = len(input)
-	for i in range(count):
-		first = int(input[i])
-		# Get digit dist behind i. Modulo count makes it wrap around.
-		second = int(input[int((i + dist) % count)])
-		if (first == second):
-			result += first
+	# Bytes of digit indicators turned into ints have bits set where the digit is.
+	# Thus the popcount of their conjunction is the number of matches of the digit.
+	for digit in range(1, 10):
+		matches = (int.from_bytes(digits.translate(DIGIT_INDICATORS[digit]), 'little')
+		           & int.from_bytes(rotated.translate(DIGIT_INDICATORS[digit]), 'little'))
+		result += digit * matches.bit_count()
 	return result
 
 
+def captchaSpectrum(input):
+	'''Compute captchas for all distances 0 to len(input) - 1 and return them as list
+
+	With numpy the circular autocorrelations of the digits' indicator vectors
+	are computed by FFT, which takes O(n log n) for all distances at once.
+	The autocorrelation of digit d at distance dist is the number of
+	matches of d, so their sum weighted by d is the captcha. Without numpy
+	captcha() is called for every distance.
+	'''
+	digits = input.encode('ascii') if isinstance(input, str) else bytes(input)
+	count = len(digits)
+	if numpy is None:
+		return [captcha(digits, dist) for dist in range(count)]
+	if 0 == count:
+		return []
+	values = numpy.frombuffer(digits, dtype=numpy.uint8) - ord('0')
+	# Autocorrelation is the inverse transform of the power spectrum
+	weightedPower = 0
+	for digit in range(1, 10):
+		transformed = numpy.fft.rfft(values == digit)
+		weightedPower = weightedPower + digit * (transformed.real ** 2 + transformed.imag ** 2)
+	spectrum = numpy.fft.irfft(weightedPower, count)
+	return numpy.rint(spectrum).astype(numpy.int64).tolist()
+
+
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 1, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	sequence = input.getFirstInputLine().encode('ascii')
+	yield captcha(sequence)
+	yield captcha(sequence, len(sequence) // 2)
+
+
 if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 1)
-	sequence = input.getFirstInputLine()
+	result1, result2 = solve(loadInput())
 
-	print ("part 1:", captcha(sequence))
-	print ("part 2:", captcha(sequence, len(sequence) / 2))
+	print ("part 1:", result1)
+	print ("part 2:", result2)
 
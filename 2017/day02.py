@@ -9,40 +9,90 @@ See http://adventofcode.com/2017
 import sys
 sys.path.append('..')
 import helpers.puzzleInput
+import collections
+import concurrent.futures
+import itertools
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 
-def checksum1(data):
-	checksum = 0
-	for row in data:
-		minVal = min(row)
-		maxVal = max(row)
-		diff = abs(maxVal - minVal)
-		checksum += diff
-	return checksum
+def shardedSum(function, rows, jobs=None):
+	'''Return sum of function(row) of all rows, computed by jobs processes if jobs > 1'''
+	if (jobs is None) or (jobs <= 1):
+		return sum(map(function, rows))
+	with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+		return sum(executor.map(function, rows, chunksize=max(1, len(rows) // (4 * jobs))))
 
 
-def checksum2(data):
-	checksum = 0
-	for row in data:
-		for i in range(len(row) - 1):
-			first = row[i]
-			# iterate over remaining row elements
-			for second in row[i+1:]:
-				# first divisible by second?
-				if 0 == first % second:
-					# // is the integer division operator
-					checksum += first // second
-				elif 0 == second % first:
-					checksum += second // first
-	return checksum
+def rowDifference(row):
+	'''Return difference between largest and smallest value of row'''
+	return max(row) - min(row)
 
 
+def rowQuotientSum(row):
+	'''Return sum of quotients of all pairs of row values of which one evenly divides the other
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 2, separator='\t', conversion=int)
+	The row's distinct values are sorted once. Multiples of each value are
+	looked up in a value index, either by sieving all multiples up to the
+	row's maximum or by checking the larger values, whatever is less.
+	'''
+	counts = collections.Counter(row)
+	values = sorted(counts)
+	if values and (values[0] <= 0):
+		raise ValueError("only positive values can be checked for divisibility")
+	result = 0
+	for index, value in enumerate(values):
+		count = counts[value]
+		# Equal values divide each other with quotient 1
+		result += count * (count - 1) // 2
+		numLargerValues = len(values) - index - 1
+		if values[-1] // value <= numLargerValues:
+			multiples = range(2 * value, values[-1] + 1, value)
+		else:
+			multiples = (other for other in itertools.islice(values, index + 1, None) if 0 == other % value)
+		for multiple in multiples:
+			# Counter returns 0 for missing values
+			result += count * counts[multiple] * (multiple // value)
+	return result
+
+
+def checksum1(data, jobs=None):
+	'''Sum of differences between largest and smallest value of each row
+
+	data is a list of rows or a two dimensional numpy array, which is
+	processed vectorized.
+	'''
+	if (numpy is not None) and isinstance(data, numpy.ndarray):
+		return int((data.max(axis=1) - data.min(axis=1)).sum())
+	return shardedSum(rowDifference, data, jobs)
+
+
+def checksum2(data, jobs=None):
+	'''Sum of quotients of the evenly divisible values of each row'''
+	if (numpy is not None) and isinstance(data, numpy.ndarray):
+		data = data.tolist()
+	return shardedSum(rowQuotientSum, data, jobs)
+
+
+
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 2, separator='\t', conversion=int, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	data = input.getInputLists()
+	yield checksum1(data)
+	yield checksum2(data)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	print ("checksum1 =", checksum1(data))
-	print ("checksum2 =", checksum2(data))
+	print ("checksum1 =", result1)
+	print ("checksum2 =", result2)
 
 
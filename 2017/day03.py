@@ -11,6 +11,7 @@ sys.path.append('..')
 import helpers.puzzleInput
 import helpers.infiniteContainers
 import itertools
+import math
 
 
 def spiralIter():
@@ -39,58 +40,130 @@ def spiralIter():
 			yield x, y
 
 
-class Data(helpers.infiniteContainers.InfiniteGrid):
-	'''Infinite grid to store values'''
-
-	class Finish(Exception):
-		'''Exception to announce reached goal'''
-		pass
+def spiralIndexToCoord(n):
+	'''Return coordinates of square n of the spiral in the order of spiralIter() starting with 1 at 0, 0
+
+	Ring k around the center consists of the squares (2k-1)^2 + 1 to (2k+1)^2,
+	so the ring and the offset m within the ring give the coordinates directly.
+	'''
+	assert n >= 1, "spiral starts with square 1"
+	ring = (math.isqrt(n - 1) + 1) // 2
+	if 0 == ring:
+		return 0, 0
+	m = n - (2 * ring - 1) ** 2 - 1
+	if m < 2 * ring:
+		# Right side going up
+		return ring, m - ring + 1
+	if m < 4 * ring:
+		# Upper side going left
+		return 3 * ring - 1 - m, ring
+	if m < 6 * ring:
+		# Left side going down
+		return -ring, 5 * ring - 1 - m
+	# Lower side going right
+	return m - 7 * ring + 1, -ring
+
+
+def coordToSpiralIndex(x, y):
+	'''Inverse of spiralIndexToCoord()'''
+	ring = max(abs(x), abs(y))
+	if 0 == ring:
+		return 1
+	if (x == ring) and (y > -ring):
+		m = y + ring - 1
+	elif y == ring:
+		m = 3 * ring - 1 - x
+	elif x == -ring:
+		m = 5 * ring - 1 - y
+	else:
+		m = x + 7 * ring - 1
+	return (2 * ring - 1) ** 2 + 1 + m
+
+
+# Estimated number of bits by which the sums of part 2 grow per ring. Later rings
+# grow by 6 to 7 bits, the first ones by less, e.g. 5 bits from ring 1 to 2. If
+# the estimate falls short, the square just grows while iterating.
+SUM_BITS_PER_RING = 6
+
+
+def _growSquare(values, rings, newRings):
+	'''Copy flat square of values for rings rings into the center of a new one for newRings rings'''
+	side = 2 * rings + 3
+	newSide = 2 * newRings + 3
+	newValues = [0] * (newSide * newSide)
+	shift = newRings - rings
+	for row in range(side):
+		start = (row + shift) * newSide + shift
+		newValues[start:start + side] = values[row * side:(row + 1) * side]
+	return newValues
+
+
+def spiralSumsIter(rings=4):
+	'''Generator to produce the sums of adjacent squares of part 2 in spiral order
+
+	The values are stored in a flat list representing a square of rings rings
+	around the center plus a margin of zeros, so the neighbors of each
+	square are at constant index offsets. If the spiral leaves the square,
+	the values are copied into a square with twice as many rings.
+	'''
+	side = 2 * rings + 3
+	values = [0] * (side * side)
+	center = (rings + 1) * (side + 1)
+	offsets = [dx * side + dy for dx, dy in helpers.infiniteContainers.MOORE_NEIGHBORHOOD]
+	values[center] = 1
+	yield 1
+	for x, y in spiralIter():
+		# Each round of the spiral starts by going right into the next ring
+		if x > rings:
+			values = _growSquare(values, rings, 2 * rings)
+			rings *= 2
+			side = 2 * rings + 3
+			center = (rings + 1) * (side + 1)
+			offsets = [dx * side + dy for dx, dy in helpers.infiniteContainers.MOORE_NEIGHBORHOOD]
+		pos = center + x * side + y
+		sum = 0
+		for offset in offsets:
+			sum += values[pos + offset]
+		values[pos] = sum
+		yield sum
 
-	def __init__(self, limit):
-		super().__init__(0)
-		self.limit = limit
-		self[0][0] = 1
 
-	def setSum(self, x, y):
-		'''Store sum of adjacent squares for part 2'''
-		sum = 0
-		sum += self[x - 1][y - 1]
-		sum += self[x - 1][y    ]
-		sum += self[x - 1][y + 1]
-		sum += self[x    ][y - 1]
-		sum += self[x    ][y + 1]
-		sum += self[x + 1][y - 1]
-		sum += self[x + 1][y    ]
-		sum += self[x + 1][y + 1]
-		self[x][y] = sum
-		if (sum > self.limit):
-			raise self.Finish()
+def firstSpiralSumAbove(limit):
+	'''Return the first sum of part 2 larger than limit'''
+	# Estimate number of rings from the sums' growth to avoid growing the square
+	rings = max(1, limit.bit_length() // SUM_BITS_PER_RING + 2)
+	for sum in spiralSumsIter(rings):
+		if sum > limit:
+			return sum
 
 
 def compute1(inputLine):
 	'''Compute solution for part 1'''
-	count = 1
-	for x, y in spiralIter():
-		count += 1
-		if count == inputLine:
-			return abs(x) + abs(y)
+	x, y = spiralIndexToCoord(inputLine)
+	return abs(x) + abs(y)
 
 
 def compute2(inputLine):
 	'''Compute solution for part 2'''
-	try:
-		data = Data(inputLine)
-		for x, y in spiralIter():
-			data.setSum(x, y)
-	except Data.Finish:
-		return data[x][y]
+	return firstSpiralSumAbove(inputLine)
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 3, conversion=int)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 3, conversion=int, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	inputLine = input.getFirstInputLine()
+	yield compute1(inputLine)
+	yield compute2(inputLine)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	print ("result1 =", compute1(inputLine))
-	print ("result2 =", compute2(inputLine))
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
 
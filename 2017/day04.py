@@ -30,11 +30,15 @@ def countInvalidPassphrases(passphrases):
 	return count
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 4)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 4, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	invalidCount1 = countInvalidPassphrases(input.getInputLists())
-	print ("result1 =", input.numInputLines() - invalidCount1)
+	yield input.numInputLines() - invalidCount1
 
 	# For part 2 we first sort each word in each phrase and then
 	# apply the same counting algorithm
@@ -42,5 +46,12 @@ if __name__ == "__main__":
 	for phrase in input.inputListsIter():
 		sortedPhrases.append(list(map(sorted, phrase)))
 	invalidCount2 = countInvalidPassphrases(sortedPhrases)
-	print ("result2 =", input.numInputLines() - invalidCount2)
+	yield input.numInputLines() - invalidCount2
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
@@ -37,14 +37,24 @@ def countSteps(maze, computeOffsetChange=(lambda jump: 1)):
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 5, conversion=int)
-	maze = input.getInputLines()
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 5, conversion=int, **options)
+
 
-	print ("result1 =", countSteps(input.getInputLines()))
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	yield countSteps(input.getInputLines())
 
 	# computeOffsetChange for part 2 returns 1 or -1 depending
 	# if jump is less 3 or not
 	computeOffsetChange = lambda jump: 1 if jump < 3 else -1
-	print ("result2 =", countSteps(input.getInputLines(), computeOffsetChange))
+	yield countSteps(input.getInputLines(), computeOffsetChange)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
@@ -11,8 +11,13 @@ sys.path.append('..')
 import helpers.puzzleInput
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 6, separator='\t', conversion=int)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 6, separator='\t', conversion=int, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	blockCounts = input.getInputLists()[0]
 
 	# List of already seen block counts
@@ -63,9 +68,16 @@ if __name__ == "__main__":
 		# Store configuration
 		results.append(blockCounts.copy())
 
-	print ("result1 =", len(results))
+	yield len(results)
 
 	# Find first appearance of repeated configuration in results
 	loopStart = results.index(blockCounts)
-	print ("result2 =", len(results) - loopStart)
+	yield len(results) - loopStart
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
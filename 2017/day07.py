@@ -96,12 +96,16 @@ class Programs:
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 7)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 7, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	programs = Programs(input)
 	bottomName = programs.bottom()
-	print ("result1 =", bottomName)
+	yield bottomName
 
 	##### second part #######
 
@@ -124,7 +128,12 @@ if __name__ == "__main__":
 
 	# Compute and apply correction
 	correction = wrongWeightProgram.totalWeight() - aRightWeightProgram.totalWeight()
-	result2 = wrongWeightProgram.weight - correction
+	yield wrongWeightProgram.weight - correction
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
+	print ("result1 =", result1)
 	print ("result2 =", result2)
 
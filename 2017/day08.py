@@ -98,12 +98,23 @@ class Program:
 		return memory
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 8)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 8, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	program = Program(input)
 	finalMemory = program.exec()
 
-	print ("result1 =", finalMemory.getCurrentMax())
-	print ("result2 =", finalMemory.getTotalMax())
+	yield finalMemory.getCurrentMax()
+	yield finalMemory.getTotalMax()
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
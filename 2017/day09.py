@@ -42,10 +42,22 @@ def totalScore(stream):
 	return (score, garbageSize)
 
 
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 9, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	# Both results come from the same pass over the stream
+	score, garbageSize = totalScore(input.getFirstInputLine())
+	yield score
+	yield garbageSize
+
+
 if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 9)
+	result1, result2 = solve(loadInput())
 
-	result1, result2 = totalScore(input.getFirstInputLine())
 	print ("result1 =", result1)
 	print ("result2 =", result2)
 
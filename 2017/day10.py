@@ -78,15 +78,27 @@ def knotHash(text):
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 10, separator=',', conversion=int)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 10, separator=',', conversion=int, **options)
+
 
-	data = input.getInputLists()[0]
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	# Part 2 needs the unconverted line, so read it only once for both parts
+	rawInput = next(input.rawInputLineIter())
+	data = [int(e) for e in rawInput.split(',')]
 	string = String()
 	string.twist(data)
-	print ("result1 =", string.check())
+	yield string.check()
+
+	yield knotHash(rawInput)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	rawInput = list(input.rawInputLineIter())[0]
-	print ("result2 =", knotHash(rawInput))
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
 
@@ -66,16 +66,27 @@ class HexCoordinates:
 			return int(absX / 2 + absY)
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 11, separator=',')
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 11, separator=',', **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	coords = HexCoordinates()
 	maxDist = 0
 	for step in input.getInputLists()[0]:
 		coords.go(step)
 		maxDist = max(maxDist, coords.fewestNumSteps())
 
-	print ("result1 =", coords.fewestNumSteps())
-	print ("result2 =", maxDist)
+	yield coords.fewestNumSteps()
+	yield maxDist
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
 
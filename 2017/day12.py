@@ -26,32 +26,46 @@ def makeGraph(input):
 	return graph
 
 
-def allNeighbors(start, neighbors=set()):
-	'''Return set of all (direct and indirect) neighbors of start'''
+def allNeighbors(graph, start, neighbors=None):
+	'''Return set of all (direct and indirect) neighbors of start in graph'''
 
+	if neighbors is None:
+		neighbors = set()
 	assert start in graph
 	neighbors.add(start)
 	for neighbor in graph[start]:
 		if (neighbor not in neighbors):
-			allNeighbors(neighbor, neighbors)
+			allNeighbors(graph, neighbor, neighbors)
 	return neighbors
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 12)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 12, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	graph = makeGraph(input)
 
-	neighborsOf0 = allNeighbors(0)
-	print ("result1 =", len(neighborsOf0))
+	neighborsOf0 = allNeighbors(graph, 0)
+	yield len(neighborsOf0)
 
 	groupCount = 0
 	remainingPrograms = set(graph.keys())
 	while (remainingPrograms):
 		# Take any remaining program
 		start = remainingPrograms.pop()
-		neighbors = allNeighbors(start)
+		neighbors = allNeighbors(graph, start)
 		# Remove neighbors of start from remainingPrograms
 		remainingPrograms -= neighbors
 		groupCount += 1
-	print ("result2 =", groupCount)
+	yield groupCount
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
@@ -9,7 +9,6 @@ See http://adventofcode.com/2017
 import sys
 sys.path.append('..')
 import helpers.puzzleInput
-import re
 
 
 
@@ -36,17 +35,9 @@ class Scanners:
 	'''Handles all scanners'''
 
 	def __init__(self, input):
-		self.scanners = []
-		for line in input.inputLineIter():
-			self._addByInputLine(line)
-
-	def _addByInputLine(self, line):
-		'''Parse input line and add scanner defined in it'''
-		m = re.search(r"(\d+):\s*(\d+)", line)
-		layer = int(m.group(1))
-		scannerRange = int(m.group(2))
-		scanner = Scanner(layer, scannerRange)
-		self.scanners.append(scanner)
+		'''Parse input lines like "layer: range" and make a scanner for each'''
+		layers, scannerRanges = input.parseRecords(r"(\d+):\s*(\d+)", ('q', 'q'))
+		self.scanners = [Scanner(layer, scannerRange) for layer, scannerRange in zip(layers, scannerRanges)]
 
 	def severity(self):
 		'''Compute severity of initial state'''
@@ -64,16 +55,27 @@ class Scanners:
 		return False
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 13)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 13, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	scanners = Scanners(input)
 
-	print ("result1 =", scanners.severity())
+	yield scanners.severity()
 
 	# Finde delay without packet being caught
 	delay = 0
 	while (scanners.isCatch(delay)):
 		delay += 1
-	print ("result2 =", delay)
+	yield delay
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
@@ -9,66 +9,59 @@ See http://adventofcode.com/2017
 import sys
 sys.path.append('..')
 import helpers.puzzleInput
+import helpers.infiniteContainers
 import day10
 
 
 GRID_SIZE = 128
 
 
-def hexDigitToBinDigits(hexDigit):
-	'''Convert a hex digit to a list of four binary digits'''
-	hexNum = int(hexDigit, 16)
-	binString = bin(hexNum).lstrip('0b').rjust(4, '0')
-	return map(int, list(binString))
+def clearRegion(grid, row, column):
+	'''Clear the bits of the region containing grid[row, column]'''
+	toExplore = [(row, column)]
+	while toExplore:
+		row, column = toExplore.pop()
+		# The grid's default 0 beyond the borders does not belong to any region.
+		if grid[row, column]:
+			grid[row, column] = 0
+			for rowOffset, columnOffset in helpers.infiniteContainers.VON_NEUMANN_NEIGHBORHOOD:
+				toExplore.append((row + rowOffset, column + columnOffset))
 
 
-def exploreRegion(grid, row, column, regionNum):
-	'''Recursively assign regionNum to grid[row][column] and its region'''
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 14, **options)
 
-	# These are valid indices, but have to be denied nevertheless
-	if (row < 0) or (column < 0):
-		return
 
-	try:
-		# grid[row][column] not part of an already explored region?
-		if 1 == grid[row][column]:
-			grid[row][column] = regionNum
-			exploreRegion(grid, row - 1, column, regionNum)
-			exploreRegion(grid, row + 1, column, regionNum)
-			exploreRegion(grid, row, column - 1, regionNum)
-			exploreRegion(grid, row, column + 1, regionNum)
-	except IndexError:
-		return
-
-
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 14)
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	inputText = input.getFirstInputLine()
 
-	# prepare grid
-	numUsedSquares = 0
-	grid = []
+	# prepare grid, each knot hash provides a row of bits
+	grid = helpers.infiniteContainers.BitGrid()
 	for row in range(GRID_SIZE):
 		rowKey = inputText + '-' + str(row)
-		hash = day10.knotHash(rowKey)
-		rowDigits = []
-		for hexDigit in hash:
-			rowDigits += hexDigitToBinDigits(hexDigit)
-		numUsedSquares += rowDigits.count(1)
-		grid.append(rowDigits)
+		grid.setRow(row, helpers.infiniteContainers.BitList.fromHex(day10.knotHash(rowKey)))
 
-	print ("result1 =", numUsedSquares)
+	yield grid.popcount()
 
 	numRegions = 0
 	for row in range(GRID_SIZE):
 		for column in range(GRID_SIZE):
 			# Are we in a new region?
-			if 1 == grid[row][column]:
+			if grid[row, column]:
 				numRegions += 1
-				# Use negative region number as new region marker in grid replacing the original 1
-				exploreRegion(grid, row, column, -numRegions)
+				# Clear the region to not count it again
+				clearRegion(grid, row, column)
+
+	yield numRegions
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	print ("result2 =", numRegions)
+	print ("result1 =", result1)
+	print ("result2 =", result2)
 
 
 
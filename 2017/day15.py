@@ -72,11 +72,19 @@ def countMatches(input, nextFunc, numSamples):
 	return count
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 15)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 15, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	yield countMatches(input, Generator.next, SAMPLE_SIZE_1)
+	yield countMatches(input, Generator.nextAcceptable, SAMPLE_SIZE_2)
 
-	result1 = countMatches(input, Generator.next, SAMPLE_SIZE_1)
-	result2 = countMatches(input, Generator.nextAcceptable, SAMPLE_SIZE_2)
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
 	print ("--------------")
 	print ("result1 =", result1)
@@ -28,7 +28,6 @@ cycle lengths for part two independently.
 import sys
 sys.path.append('..')
 import helpers.puzzleInput
-import re
 
 
 SIZE = 16
@@ -82,35 +81,22 @@ class Operation:
 class Perm(Operation):
 	'''Permutation of positions of the programs'''
 
-	def __init__(self, danceMoves):
-		'''Combine permutational moves of danceMoves to a joint permutation'''
-		super().__init__()
-		def spin(spinCmd):
-			'''Do a spin move'''
-			m = re.match(r"s(\d+)", spinCmd)
-			x = int(m.group(1))
-			newPerm = self.perm[-x:] + self.perm[:-x]
-			self.perm[:] = newPerm[:]
-
-		def exchange(spinCmd):
-			'''Do an exchange move'''
-			m = re.match(r"x(\d+)/(\d+)", spinCmd)
-			a = int(m.group(1))
-			b = int(m.group(2))
-			self.swap(self.perm, a, b)
-
-		def doMove(move):
-			'''Determine move type and execute it'''
-			if 's' == move[0]:
-				spin(move)
-			elif 'x' == move[0]:
-				exchange(move)
+	def __init__(self, spins, exchangesA, exchangesB):
+		'''Combine permutational moves to a joint permutation
 
+		The arguments are the columns of the parsed dance moves. Each move
+		has either its spin or its exchange fields set, the others are empty.
+		'''
+		super().__init__()
 		# Init with identical permutation
 		self.perm = list(range(SIZE))
 		# Apply moves
-		for move in danceMoves:
-			doMove(move)
+		for spin, a, b in zip(spins, exchangesA, exchangesB):
+			if spin:
+				x = int(spin)
+				self.perm[:] = self.perm[-x:] + self.perm[:-x]
+			elif a:
+				self.swap(self.perm, int(a), int(b))
 
 	def apply(self, line):
 		'''Apply permutation to program line'''
@@ -120,15 +106,16 @@ class Perm(Operation):
 class PartnerMapping(Operation):
 	'''Joint partner moves of all dance moves'''
 
-	def __init__(self, danceMoves):
-		'''Combine partner moves of danceMoves to a joint move'''
+	def __init__(self, partnersA, partnersB):
+		'''Combine partner moves to a joint move
+
+		The arguments are the partner columns of the parsed dance moves,
+		which are empty for the other moves.
+		'''
 		super().__init__()
 		line = self.makeLine()
-		for move in danceMoves:
-			if 'p' == move[0]:
-				m = re.match(r"p(.)/(.)", move)
-				a = m.group(1)
-				b = m.group(2)
+		for a, b in zip(partnersA, partnersB):
+			if a:
 				self.swap(line, line.index(a), line.index(b))
 		self.mapping = dict(zip(self.makeLine(), line))
 
@@ -137,23 +124,37 @@ class PartnerMapping(Operation):
 		return [self.mapping[l] for l in line]
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 16, separator=',')
-	danceMoves = input.getInputLists()[0]
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 16, separator=',', **options)
+
 
-	perm = Perm(danceMoves)
-	partnerMapping = PartnerMapping(danceMoves)
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	# One column per group, the groups of the other move types stay empty
+	spins, exchangesA, exchangesB, partnersA, partnersB = input.parseRecords(
+		r"s(\d+)|x(\d+)/(\d+)|p(\w)/(\w)", (str,) * 5)
+
+	perm = Perm(spins, exchangesA, exchangesB)
+	partnerMapping = PartnerMapping(partnersA, partnersB)
 
 	# Part 1: apply moves once
 	letterLine1 = PartnerMapping.makeLine()
 	letterLine1 = perm.apply(letterLine1)
 	letterLine1 = partnerMapping.apply(letterLine1)
-	print("result1 =", ''.join(letterLine1))
+	yield ''.join(letterLine1)
 
 	# Part 1: apply moves many times
 	letterLine2 = PartnerMapping.makeLine()
 	letterLine2 = perm.multipleApply(letterLine2, NUM_CYCLES)
 	letterLine2 = partnerMapping.multipleApply(letterLine2, NUM_CYCLES)
-	print("result2 =", ''.join(letterLine2))
+	yield ''.join(letterLine2)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print("result1 =", result1)
+	print("result2 =", result2)
 
 
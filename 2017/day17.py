@@ -46,11 +46,23 @@ def getResult2(inputValue):
 	return result2
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 17, conversion=int)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 17, conversion=int, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	inputValue = input.getFirstInputLine()
 
-	print("result1 =", getResult1(inputValue))
-	print("result2 =", getResult2(inputValue))
+	yield getResult1(inputValue)
+	yield getResult2(inputValue)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
+
+	print("result1 =", result1)
+	print("result2 =", result2)
 
 
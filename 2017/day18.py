@@ -231,16 +231,24 @@ class Program2Control:
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 18)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 18, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	# Execute program as defined for part 1
 	program1 = Program1(input)
-	result1 = program1.exec()
+	yield program1.exec()
 
 	# Execute program as defined for part 2
 	program2 = Program2Control(input)
-	result2 = program2.exec()
+	yield program2.exec()
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
 	print("result1 =", result1)
 	print("result2 =", result2)
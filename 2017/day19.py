@@ -109,13 +109,25 @@ class Diagram:
 		return pathLetters, numSteps
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 19)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 19, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	# Both results come from the same walk
 	diagram = Diagram(input)
-	result1, result2 = diagram.walkRoute()
+	pathLetters, numSteps = diagram.walkRoute()
+
+	yield ''.join(pathLetters)
+	yield numSteps
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	print("result1 =", ''.join(result1))
+	print("result1 =", result1)
 	print("result2 =", result2)
 
 
@@ -9,7 +9,6 @@ See http://adventofcode.com/2017
 import sys
 sys.path.append('..')
 import helpers.puzzleInput
-import re
 import itertools
 import math
 
@@ -17,10 +16,9 @@ import math
 class Vector:
 	'''Position, velocity, or acceleration vector'''
 
-	def __init__(self, code):
-		'''Parse code for coordinates'''
-		m = re.search(r"(-?\d+),(-?\d+),(-?\d+)", code)
-		self.coords = [int(m.group(1)), int(m.group(2)), int(m.group(3))]
+	def __init__(self, coords):
+		'''Init with list of coordinates'''
+		self.coords = coords
 
 	def manhattan(self):
 		'''Compute Manhattan length'''
@@ -38,11 +36,11 @@ class Vector:
 class Particle:
 	'''Container for particle properties'''
 
-	def __init__(self, line):
-		m = re.search(r"p=<(.*)>, v=<(.*)>, a=<(.*)>", line)
-		self.p = Vector(m.group(1))
-		self.v = Vector(m.group(2))
-		self.a = Vector(m.group(3))
+	def __init__(self, coords):
+		'''Init from the nine coordinates of position, velocity, and acceleration'''
+		self.p = Vector(list(coords[0:3]))
+		self.v = Vector(list(coords[3:6]))
+		self.a = Vector(list(coords[6:9]))
 
 
 def findClosest(particles):
@@ -115,12 +113,25 @@ def numNonColliding(particles):
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 20)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 20, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	vector = r"<(-?\d+),(-?\d+),(-?\d+)>"
+	columns = input.parseRecords(r"p={0}, v={0}, a={0}".format(vector), ('q',) * 9)
+	particles = [Particle(coords) for coords in zip(*columns)]
 
-	particles = [Particle(line) for line in input.inputLineIter()]
+	yield findClosest(particles)
+	yield numNonColliding(particles)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	print("result1 =", findClosest(particles))
-	print("result2 =", numNonColliding(particles))
+	print("result1 =", result1)
+	print("result2 =", result2)
 
 
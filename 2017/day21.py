@@ -161,12 +161,20 @@ def numPixelsOnAfterEnhancements(rules, numEnhancements):
 	return grid.numPixelsOn()
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 21)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 21, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	rules = Rules(input)
-	result1 = numPixelsOnAfterEnhancements(rules, 5)
-	result2 = numPixelsOnAfterEnhancements(rules, 18)
+	yield numPixelsOnAfterEnhancements(rules, 5)
+	yield numPixelsOnAfterEnhancements(rules, 18)
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
 	print("result1 =", result1)
 	print("result2 =", result2)
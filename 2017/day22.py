@@ -24,17 +24,18 @@ FLAGGED = "F"
 class Carrier:
 	'''Virus Carrier'''
 
-	def __init__(self, inputIter, transitions):
+	def __init__(self, inputIter, transitions, gridClass=helpers.infiniteContainers.InfiniteGrid):
 		'''Init Carrier with initial node states (input) and state transitions
 		
 		A transition maps a current state on a turn direction and a new state.
+		gridClass may be any grid of helpers.infiniteContainers.
 		'''
 
 		# Infinite grid of notes with default state CLEAN
-		self.grid = helpers.infiniteContainers.InfiniteGrid(CLEAN)
+		self.grid = gridClass(CLEAN)
 		for y, line in zip(itertools.count(), inputIter):
 			for x, node in zip(itertools.count(), line):
-				self.grid[x][y] = node
+				self.grid[x, y] = node
 		# Start at the center
 		self.currX = x // 2
 		self.currY = y // 2
@@ -63,26 +64,34 @@ class Carrier:
 
 	def burst(self):
 		'''Perform a single burst'''
-		currState = self.grid[self.currX][self.currY]
+		currState = self.grid[self.currX, self.currY]
 		turnDir, newState = self.transitions[currState]
 		self._turn(turnDir)
-		self.grid[self.currX][self.currY] = newState
+		self.grid[self.currX, self.currY] = newState
 		if INFECTED == newState:
 			self.infectionCount += 1
 		self._moveForward()
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 22)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 22, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	# Both parts start from the input, which may be a stream that can only be read once
+	lines = input.getInputLines()
 
 	# Part 1
 	transitions1 = {
 		INFECTED: ("right", CLEAN   ),
 		CLEAN:    ("left" , INFECTED),
 	}
-	carrier1 = Carrier(input.inputLineIter(), transitions1)
+	carrier1 = Carrier(lines, transitions1)
 	carrier1.multipleBursts(10000)
+	yield carrier1.infectionCount
 
 	# Part 2
 	transitions2 = {
@@ -91,11 +100,15 @@ if __name__ == "__main__":
 		FLAGGED:  ("reverse", CLEAN   ),
 		WEAKENED: ("none"   , INFECTED),
 	}
-	carrier2 = Carrier(input.inputLineIter(), transitions2)
+	carrier2 = Carrier(lines, transitions2)
 	carrier2.multipleBursts(10000000, 100000)
+	yield carrier2.infectionCount
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	# Results
-	print("result1 =", carrier1.infectionCount)
-	print("result2 =", carrier2.infectionCount)
+	print("result1 =", result1)
+	print("result2 =", result2)
 
 
@@ -109,18 +109,27 @@ class Program2:
 		return h
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 23)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 23, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
 	# Execute program as defined for part 1
 	program1 = Program1(input)
 	program1.exec()
+	yield program1.mulCount
 
 	# Execute modified program for part 2
 	program2 = Program2()
-	result2 = program2.exec()
+	yield program2.exec()
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	print("result1 =", program1.mulCount)
+	print("result1 =", result1)
 	print("result2 =", result2)
 
 
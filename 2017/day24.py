@@ -9,7 +9,6 @@ See http://adventofcode.com/2017
 import sys
 sys.path.append('..')
 import helpers.puzzleInput
-import re
 import copy
 import pprint
 import itertools
@@ -24,10 +23,8 @@ class Component:
 		'''Exception raised when a component cannot be applied'''
 		pass
 
-	def __init__(self, line):
-		'''Extract component's ports from line'''
-		m = re.match(r"(\d+)/(\d+)", line)
-		self.ports = [int(m.group(1)), int(m.group(2))]
+	def __init__(self, port0, port1):
+		self.ports = [port0, port1]
 		self.connectedPort = None
 		self.freePort = None
 
@@ -66,8 +63,9 @@ class AllComponents:
 	'''Handle all bridge components'''
 
 	def __init__(self, input):
-		'''Make list of components given by inpur'''
-		self.components = [Component(line) for line in input.inputLineIter()]
+		'''Make list of components given by input lines like "port/port"'''
+		ports0, ports1 = input.parseRecords(r"(\d+)/(\d+)", ('q', 'q'))
+		self.components = [Component(port0, port1) for port0, port1 in zip(ports0, ports1)]
 
 	def _iterateSubComponents(self, port, length=0, strength=0):
 		'''Recursively apply all free components with given port
@@ -114,13 +112,25 @@ class AllComponents:
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 24)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 24, **options)
+
 
+def solve(input):
+	'''Yield results of part 1 and 2'''
+	# Both results come from the same recursion over all bridges
 	allComponents= AllComponents(input)
-	allComponents.findMaxStrengths()
+	maxStrength, maxLengthStrength = allComponents.findMaxStrengths()
+
+	yield maxStrength
+	yield maxLengthStrength
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 
-	print("result1 =", allComponents.maxStrength)
-	print("result2 =", allComponents.maxLengthStrength)
+	print("result1 =", result1)
+	print("result2 =", result2)
 
 
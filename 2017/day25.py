@@ -25,11 +25,12 @@ class Rule:
 		self.newState = newState
 
 
-class Tape(helpers.infiniteContainers.DeInfiniteList):
+class Tape(helpers.infiniteContainers.BitList):
 	'''The infinite tape of the turing machine'''
 
 	def __init__(self):
-		super().__init__(default=0)
+		# Tape values are 0 and 1 only, so they fit into bits
+		super().__init__()
 		self.currPos = 0
 
 	def apply(self, rule):
@@ -43,9 +44,7 @@ class Tape(helpers.infiniteContainers.DeInfiniteList):
 
 	def checksum(self):
 		'''Compute checksum'''
-
-		# infiniteContainers.DeInfiniteList is iterable so we can simply sum it
-		return sum(self)
+		return self.popcount()
 
 
 class State:
@@ -92,11 +91,24 @@ class Machine:
 
 
 
-if __name__ == "__main__":
-	input = helpers.puzzleInput.Input(2017, 25)
+def loadInput(**options):
+	'''Load today's input passing options on to helpers.puzzleInput.Input'''
+	return helpers.puzzleInput.Input(2017, 25, **options)
+
+
+def solve(input):
+	'''Yield results of part 1 and 2
 
+	The input has been parsed manually into Machine, so input is not used.
+	This day has no part 2, so its result is None.
+	'''
 	machine = Machine()
-	result1 = machine.run()
+	yield machine.run()
+	yield None
+
+
+if __name__ == "__main__":
+	result1, result2 = solve(loadInput())
 	print("result1 =", result1)
 
 	# This day has no part 2
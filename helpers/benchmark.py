@@ -0,0 +1,276 @@
+#!/usr/bin/python3
+'''
+Author: Björn Hendriks
+
+See http://adventofcode.com
+
+Benchmark the daily solutions and the infinite containers
+
+Call this module from the repository's root folder, e.g.:
+
+    python -m helpers.benchmark 2017 --days 1-25 --repeat 3 --output results.json
+
+Each day is measured in the phases input load, part 1, and part 2 by stepping
+through its solve() generator. The containers of helpers.infiniteContainers
+are measured by some typical workloads in a single phase. For every phase the
+minimum wall time and CPU time of all repetitions are recorded. Peak memory is
+measured in an additional run with tracemalloc, because tracing distorts the
+times.
+
+The results are compared against a baseline file. Phases slower than the
+baseline by more than the threshold are reported as regressions and make the
+benchmark exit with status 1. Use --update-baseline to store the results as
+new baseline.
+'''
+
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import traceback
+import tracemalloc
+import helpers.infiniteContainers
+import helpers.run
+
+
+# Adapt this constant to change the default baseline file
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarkBaseline.json')
+# Relative slowdown of wall time reported as regression
+DEFAULT_THRESHOLD = 0.2
+# Phases faster than this number of seconds in the baseline are too noisy to compare
+MIN_COMPARE_SECONDS = 0.005
+
+
+class PhaseTimer:
+	'''Measure consecutive phases of a single run'''
+
+	def __init__(self, traceMemory=False):
+		self.traceMemory = traceMemory
+		self.phases = {}
+
+	@contextlib.contextmanager
+	def phase(self, name):
+		'''Context manager measuring the code executed within as phase name'''
+		if self.traceMemory:
+			tracemalloc.start()
+		wallStart = time.perf_counter()
+		cpuStart = time.process_time()
+		try:
+			yield
+		finally:
+			measurement = {
+				'wall': time.perf_counter() - wallStart,
+				'cpu': time.process_time() - cpuStart,
+				}
+			if self.traceMemory:
+				measurement['peakMemory'] = tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+			self.phases[name] = measurement
+
+
+def runDayPhases(module, timer):
+	'''Run a day's solution split into phases'''
+	with timer.phase('load'):
+		input = module.loadInput()
+	results = module.solve(input)
+	with timer.phase('part1'):
+		next(results)
+	with timer.phase('part2'):
+		next(results)
+
+
+def containerInfiniteList(timer):
+	'''Grow InfiniteList element by element and read it back'''
+	with timer.phase('run'):
+		infiniteList = helpers.infiniteContainers.InfiniteList(0)
+		for i in range(200000):
+			infiniteList[i] = i
+		sum(infiniteList[i] for i in range(200000))
+
+
+def containerTape(tapeClass, timer):
+	'''Walk back and forth across the origin of a double ended list like a Turing tape'''
+	with timer.phase('run'):
+		tape = tapeClass()
+		pos = 0
+		for i in range(200000):
+			tape[pos] = 1 - tape[pos]
+			# Zigzag with growing amplitude
+			pos += 1 if (i // 1000) % 2 == 0 else -1
+			pos -= (i % 3 == 0)
+		sum(tape)
+
+
+def containerInfiniteGrid(timer):
+	'''Write an InfiniteGrid square around the origin by rows and read it by tuple indices'''
+	with timer.phase('run'):
+		grid = helpers.infiniteContainers.InfiniteGrid(0)
+		for x in range(-150, 150):
+			for y in range(-150, 150):
+				grid[x][y] = x + y
+		total = 0
+		for x in range(-150, 150):
+			for y in range(-150, 150):
+				total += grid[x, y]
+
+
+def containerGridWalk(gridClass, timer):
+	'''Toggle cells on a drifting random walk, which visits a sparse and lopsided region'''
+	with timer.phase('run'):
+		grid = gridClass(0)
+		# Same walk in every run
+		rng = random.Random(22)
+		steps = [(1, 0), (0, 1), (-1, 0), (0, -1), (1, 0), (0, 1)]
+		x = y = 0
+		for i in range(200000):
+			grid[x, y] = 1 - grid[x, y]
+			dx, dy = rng.choice(steps)
+			x += dx
+			y += dy
+
+
+def containerInfiniteNDGrid(timer):
+	'''Write a 3D cube around the origin of an InfiniteNDGrid and sum the neighbors of its inner elements'''
+	with timer.phase('run'):
+		grid = helpers.infiniteContainers.InfiniteNDGrid(3, 0)
+		for x in range(-20, 20):
+			for y in range(-20, 20):
+				for z in range(-20, 20):
+					grid[x, y, z] = (x + y + z) & 1
+		total = 0
+		for x in range(-10, 10):
+			for y in range(-10, 10):
+				for z in range(-10, 10):
+					total += grid.neighborsSum((x, y, z))
+
+
+CONTAINER_BENCHMARKS = {
+	'InfiniteList': containerInfiniteList,
+	'DeInfiniteList': functools.partial(containerTape, helpers.infiniteContainers.DeInfiniteList),
+	'BitList': functools.partial(containerTape, helpers.infiniteContainers.BitList),
+	'InfiniteGrid': containerInfiniteGrid,
+	'InfiniteGridWalk': functools.partial(containerGridWalk, helpers.infiniteContainers.InfiniteGrid),
+	'SparseGridWalk': functools.partial(containerGridWalk, helpers.infiniteContainers.SparseGrid),
+	'InfiniteNDGrid': containerInfiniteNDGrid,
+	}
+
+
+def measure(run, repeat):
+	'''Run run(timer) repeat times and once more tracing memory, return combined phases'''
+	combined = {}
+	for i in range(repeat):
+		timer = PhaseTimer()
+		run(timer)
+		for name, measurement in timer.phases.items():
+			best = combined.setdefault(name, dict(measurement))
+			best['wall'] = min(best['wall'], measurement['wall'])
+			best['cpu'] = min(best['cpu'], measurement['cpu'])
+	timer = PhaseTimer(traceMemory=True)
+	run(timer)
+	for name, measurement in timer.phases.items():
+		combined[name]['peakMemory'] = measurement['peakMemory']
+	return combined
+
+
+def runBenchmarks(year, days, repeat, withContainers=True):
+	'''Run benchmarks and return dict mapping benchmark name on its phases'''
+	results = {}
+	for day in days:
+		name = "{:04d}/day{:02d}".format(year, day)
+		print("benchmarking", name)
+		try:
+			module = helpers.run.importDay(year, day)
+			# Hide what the days print
+			with contextlib.redirect_stdout(io.StringIO()):
+				results[name] = measure(lambda timer: runDayPhases(module, timer), repeat)
+		except OSError as e:
+			# Most likely the input file is missing
+			print("   skipped:", e)
+		except Exception:
+			# Keep the measurements of the other days
+			print("   failed:")
+			traceback.print_exc(file=sys.stdout)
+	if withContainers:
+		for containerName, run in CONTAINER_BENCHMARKS.items():
+			name = "containers/" + containerName
+			print("benchmarking", name)
+			results[name] = measure(run, repeat)
+	return results
+
+
+def compare(results, baseline, threshold):
+	'''Print comparison of results with baseline and return list of regressions'''
+	regressions = []
+	print("\n{:<28} {:<6} {:>10} {:>10} {:>8} {:>12}".format(
+		"benchmark", "phase", "wall [s]", "base [s]", "ratio", "peak [KiB]"))
+	for name, phases in sorted(results.items()):
+		for phase, measurement in phases.items():
+			baseMeasurement = baseline.get(name, {}).get(phase)
+			line = "{:<28} {:<6} {:10.4f}".format(name, phase, measurement['wall'])
+			if baseMeasurement is None:
+				line += " {:>10}".format("-")
+			else:
+				ratio = measurement['wall'] / baseMeasurement['wall'] if baseMeasurement['wall'] else 1.0
+				line += " {:10.4f} {:8.2f}".format(baseMeasurement['wall'], ratio)
+				if (baseMeasurement['wall'] >= MIN_COMPARE_SECONDS) and (ratio > 1 + threshold):
+					regressions.append((name, phase, ratio))
+					line += " !"
+			print(line, " {:>11.1f}".format(measurement['peakMemory'] / 1024))
+	return regressions
+
+
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Benchmark Advent of Code solutions and helpers")
+	parser.add_argument('year', type=int)
+	parser.add_argument('--days', default="1-25", help='days to benchmark like "1-5,7" (default: 1-25)')
+	parser.add_argument('--no-days', action='store_true', help="only benchmark the containers")
+	parser.add_argument('--no-containers', action='store_true', help="do not benchmark the containers")
+	parser.add_argument('--repeat', type=int, default=3, help="number of timed runs (default: 3)")
+	parser.add_argument('--output', help="write results to this JSON file")
+	parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline JSON file to compare with")
+	parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+	                    help="relative slowdown reported as regression (default: {})".format(DEFAULT_THRESHOLD))
+	parser.add_argument('--update-baseline', action='store_true', help="store results as new baseline")
+	args = parser.parse_args(args)
+
+	days = [] if args.no_days else helpers.run.parseDays(args.days)
+	results = runBenchmarks(args.year, days, args.repeat, not args.no_containers)
+	document = {
+		'python': platform.python_version(),
+		'machine': platform.machine(),
+		'repeat': args.repeat,
+		'results': results,
+		}
+	if args.output:
+		with open(args.output, 'w') as outputFile:
+			json.dump(document, outputFile, indent='\t', sort_keys=True)
+
+	try:
+		with open(args.baseline) as baselineFile:
+			baseline = json.load(baselineFile)['results']
+	except FileNotFoundError:
+		baseline = {}
+	regressions = compare(results, baseline, args.threshold)
+
+	if args.update_baseline:
+		# Keep baseline entries not measured this time
+		baseline.update(results)
+		document['results'] = baseline
+		with open(args.baseline, 'w') as baselineFile:
+			json.dump(document, baselineFile, indent='\t', sort_keys=True)
+			baselineFile.write('\n')
+		print("\nbaseline updated:", args.baseline)
+	elif regressions:
+		print("\n{} regression(s) above threshold {:.0%}".format(len(regressions), args.threshold))
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
@@ -8,16 +8,90 @@ Some containers which grow arbitrarily
 '''
 
 
+import array
 import copy
+import functools
 import itertools
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+# Defaults of these types cannot change, so all new elements may share them
+IMMUTABLE_TYPES = (int, float, complex, bool, str, bytes, frozenset, type(None))
+
+# InfiniteGrid stores its elements in square chunks with edges of this power of 2
+GRID_CHUNK_BITS = 6
+GRID_CHUNK_SIZE = 1 << GRID_CHUNK_BITS
+GRID_CHUNK_MASK = GRID_CHUNK_SIZE - 1
+
+# InfiniteNDGrid chunks have at most 2**ND_CHUNK_ELEMENT_BITS elements
+ND_CHUNK_ELEMENT_BITS = 12
+
+# Offsets of an element's neighbors in a grid including or excluding diagonal neighbors
+MOORE_NEIGHBORHOOD = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+VON_NEUMANN_NEIGHBORHOOD = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
+# Bytes with reversed bit order to convert between most and least significant bit first
+_REVERSED_BITS = bytes(int("{:08b}".format(b)[::-1], 2) for b in range(256))
+
+# SparseGrid packs both indices into a single int key, so second indices must fit this many bits
+SPARSE_Y_BITS = 32
+SPARSE_Y_MASK = (1 << SPARSE_Y_BITS) - 1
+SPARSE_Y_LIMIT = 1 << (SPARSE_Y_BITS - 1)
+
+
+def isImmutable(value):
+	'''Check if value is of an immutable type'''
+	if type(value) is tuple:
+		return all(isImmutable(v) for v in value)
+	return type(value) in IMMUTABLE_TYPES
+
+
+def _updateValueCounts(valueCounts, default, oldVal, newVal):
+	'''Update valueCounts, which counts all values differing from default, for replacing oldVal by newVal'''
+	if oldVal != default:
+		valueCounts[oldVal] -= 1
+		if 0 == valueCounts[oldVal]:
+			del valueCounts[oldVal]
+	if newVal != default:
+		valueCounts[newVal] = valueCounts.get(newVal, 0) + 1
+
+
+def _countValue(valueCounts, default, numElements, value):
+	'''Return number of elements equal to value from valueCounts and the total number of elements'''
+	if value == default:
+		return numElements - sum(valueCounts.values())
+	return valueCounts.get(value, 0)
 
 
 class InfiniteList:
-	'''List which grows arbitrarily'''
+	'''List which grows arbitrarily
+
+	New elements are deep copies of the default or the default itself
+	if it is immutable. If a typecode is given, the elements are stored
+	in an array.array of that type instead of a list, which saves the
+	Python object per element. Default and all values must fit the
+	typecode then.
+
+	Only writes grow the list. Reading beyond its end returns the default
+	without storing it, unless materializeOnRead is set. Mutable defaults
+	are always stored on reading, because the caller may modify them.
 
-	def __init__(self, default=0):
+	If countValues is set, valueCounts maps every value differing from the
+	default on its number of occurrences. It is updated on every write, so
+	count() and the in operator take constant time. Values must be hashable
+	and the default immutable then.
+	'''
+
+	def __init__(self, default=0, typecode=None, materializeOnRead=False, countValues=False):
+		assert not countValues or isImmutable(default), "counting values requires an immutable default"
 		self.default = default
-		self.data = []
+		self.typecode = typecode
+		self.materializeOnRead = materializeOnRead or not isImmutable(default)
+		self.valueCounts = {} if countValues else None
+		self.data = [] if typecode is None else array.array(typecode)
 
 	def __len__(self):
 		return len(self.data)
@@ -26,83 +100,446 @@ class InfiniteList:
 		return iter(self.data)
 
 	def __contains__(self, item):
+		if self.valueCounts is not None:
+			return self.count(item) > 0
 		return item in self.data
 
 	def __str__(self):
 		return ', '.join(map(str, self.data))
 
+	def count(self, value):
+		'''Return number of elements equal to value'''
+		if self.valueCounts is not None:
+			return _countValue(self.valueCounts, self.default, len(self.data), value)
+		return self.data.count(value)
+
+	def _newElements(self, num):
+		'''Make num default elements to append to data'''
+		if self.typecode is not None:
+			return array.array(self.typecode, [self.default]) * num
+		if isImmutable(self.default):
+			return [self.default] * num
+		return [copy.deepcopy(self.default) for j in range(num)]
+
 	def _checkIndex(self, i):
 		if i >= len(self.data):
 			numMissingElements = i - (len(self.data) - 1)
-			self.data += [copy.deepcopy(self.default) for j in range(numMissingElements)]
+			# Appending to lists and arrays over-allocates, so growth is amortized O(1)
+			self.data += self._newElements(numMissingElements)
 
 	def __getitem__(self, i):
+		if (i >= len(self.data)) and not self.materializeOnRead:
+			return self.default
 		self._checkIndex(i)
 		return self.data[i]
 
 	def __setitem__(self, i, val):
 		self._checkIndex(i)
+		if (self.valueCounts is not None) and (self.data[i] != val):
+			_updateValueCounts(self.valueCounts, self.default, self.data[i], val)
 		self.data[i] = val
 
 
 
 class DeInfiniteList:
 	'''Double ended InfiniteList: list which grows arbitrarily in positive and negative direction
+
+	All elements are stored in a single list, or array.array if a typecode is
+	given, with index 0 located at storage position _origin. If an index beyond
+	either end of the storage is accessed, the storage grows at that end by at
+	least its current size, so growing is amortized O(1) at both ends. Only the
+	range borders() of indices accessed so far counts as content, the remaining
+	storage is spare capacity.
+
+	Only writes extend the content. Reading outside of it returns the
+	default without storing it, unless materializeOnRead is set. Mutable
+	defaults are always stored on reading, because the caller may modify
+	them.
+
+	Like for InfiniteList, countValues makes valueCounts count the values
+	differing from the default within the content.
+
+	Slices use the same indices as single elements, so dl[-2:3] returns the
+	elements at indices -2 to 2. Omitted slice borders are the content borders.
 	'''
 
-	def __init__(self, default=0):
+	# Minimum number of elements to grow the storage by
+	MIN_GROWTH = 8
+
+	def __init__(self, default=0, typecode=None, materializeOnRead=False, countValues=False):
+		assert not countValues or isImmutable(default), "counting values requires an immutable default"
 		self.default = default
-		self._posArm = InfiniteList(default)
-		self._negArm = InfiniteList(default)
+		self.typecode = typecode
+		self.materializeOnRead = materializeOnRead or not isImmutable(default)
+		self.valueCounts = {} if countValues else None
+		self.data = [] if typecode is None else array.array(typecode)
+		self._origin = 0
+		# Range of indices written, or read if materializeOnRead, so far
+		self._first = 0
+		self._last = -1
 
 	def __len__(self):
-		return len(self._negArm) + len(self._posArm)
+		return self._last - self._first + 1
 
 	def __iter__(self):
-		return itertools.chain(reversed(self._negArm), self._posArm)
+		return itertools.islice(self.data, self._origin + self._first, self._origin + self._last + 1)
 
 	def __contains__(self, item):
-		return (item in self._negArm) or (item in self._posArm)
+		if self.valueCounts is not None:
+			return self.count(item) > 0
+		return item in iter(self)
 
 	def __str__(self):
-		return (', '.join([str(e) for e in reversed(self._negArm)])
-	                 + " | " + ', '.join([str(e) for e in self._posArm]))
+		return (', '.join([str(e) for e in self.data[self._origin + self._first:self._origin]])
+		        + " | " + ', '.join([str(e) for e in self.data[self._origin:self._origin + self._last + 1]]))
+
+	def _spareElements(self, num):
+		'''Make num elements of spare capacity
+
+		Mutable defaults are only copied when their index becomes part of
+		the content, so spare capacity is filled with None then.
+		'''
+		if self.typecode is not None:
+			return array.array(self.typecode, [self.default]) * num
+		if isImmutable(self.default):
+			return [self.default] * num
+		return [None] * num
+
+	def _reserve(self, i):
+		'''Grow storage such that it contains index i'''
+		pos = self._origin + i
+		if pos < 0:
+			num = max(-pos, len(self.data), self.MIN_GROWTH)
+			self.data[0:0] = self._spareElements(num)
+			self._origin += num
+		elif pos >= len(self.data):
+			num = max(pos - len(self.data) + 1, len(self.data), self.MIN_GROWTH)
+			self.data += self._spareElements(num)
+
+	def _checkIndex(self, i):
+		'''Extend content to index i'''
+		if self._first <= i <= self._last:
+			return
+		self._reserve(i)
+		newFirst = min(self._first, i)
+		newLast = max(self._last, i)
+		if (self.typecode is None) and not isImmutable(self.default):
+			for j in itertools.chain(range(newFirst, self._first), range(self._last + 1, newLast + 1)):
+				self.data[self._origin + j] = copy.deepcopy(self.default)
+		self._first = newFirst
+		self._last = newLast
 
-	def _getArm(self, i):
-		if i >= 0:
-			return self._posArm, i
+	def _sliceRange(self, s):
+		'''Convert slice s into range of indices'''
+		step = 1 if s.step is None else s.step
+		if step > 0:
+			start = self._first if s.start is None else s.start
+			stop = self._last + 1 if s.stop is None else s.stop
 		else:
-			return self._negArm, -(i + 1)
+			start = self._last if s.start is None else s.start
+			stop = self._first - 1 if s.stop is None else s.stop
+		return range(start, stop, step)
+
+	def __getitem__(self, i):
+		if isinstance(i, slice):
+			indices = self._sliceRange(i)
+			if not indices:
+				return self.data[0:0]
+			low, high = min(indices[0], indices[-1]), max(indices[0], indices[-1])
+			if not self.materializeOnRead and not (self._first <= low and high <= self._last):
+				values = [self[j] for j in indices]
+				return values if self.typecode is None else array.array(self.typecode, values)
+			# Like single elements, reading a slice extends the content
+			self._checkIndex(indices[0])
+			self._checkIndex(indices[-1])
+			forward = indices if indices.step > 0 else indices[::-1]
+			result = self.data[self._origin + forward.start:self._origin + forward.stop:forward.step]
+			return result if indices.step > 0 else result[::-1]
+		if not (self._first <= i <= self._last):
+			if not self.materializeOnRead:
+				return self.default
+			self._checkIndex(i)
+		return self.data[self._origin + i]
+
+	def __setitem__(self, i, val):
+		self._checkIndex(i)
+		pos = self._origin + i
+		# Rewriting the same value, which is frequent, does not change the counts
+		if (self.valueCounts is not None) and (self.data[pos] != val):
+			_updateValueCounts(self.valueCounts, self.default, self.data[pos], val)
+		self.data[pos] = val
+
+	def count(self, value):
+		'''Return number of elements equal to value within the content'''
+		if self.valueCounts is not None:
+			return _countValue(self.valueCounts, self.default, len(self), value)
+		return sum(1 for e in self if e == value)
+
+	def borders(self):
+		return self._first, self._last
+
+	def view(self):
+		'''Return memoryview of the content without copying it
+
+		Requires a typecode. numpy.asarray() turns the view into a numpy array
+		without copying as well. The storage cannot grow while a view exists.
+		'''
+		if self.typecode is None:
+			raise TypeError("view() requires a DeInfiniteList with typecode")
+		return memoryview(self.data)[self._origin + self._first:self._origin + self._last + 1]
+
+
+class BitList:
+	'''List of bits which grows arbitrarily in positive and negative direction
+
+	The bits are packed into a bytearray, which takes an eighth of the memory
+	of a DeInfiniteList with typecode 'b'. Index i is stored at bit position
+	_offset + i of the little endian int made of the bytearray. Thus
+	popcount() and the bitwise operators &, |, and ^ work on entire ints
+	instead of single bits.
+
+	Like DeInfiniteList, borders() is the range of indices written so far
+	and reading outside of it returns 0 without growing. The bitwise
+	operators align both operands by index and return a new BitList
+	spanning both operands' borders. Slices are not supported.
+	'''
+
+	# Minimum number of bytes to grow the storage by
+	MIN_GROWTH = 8
+
+	def __init__(self):
+		self.data = bytearray()
+		# Bit position of index 0, always a multiple of 8
+		self._offset = 0
+		# Range of indices written so far
+		self._first = 0
+		self._last = -1
+
+	@classmethod
+	def fromHex(cls, hexText):
+		'''Make BitList from hex digits with the most significant bit of the first digit at index 0'''
+		bits = cls()
+		numDigits = len(hexText)
+		if numDigits % 2:
+			hexText += '0'
+		bits.data = bytearray(bytes.fromhex(hexText).translate(_REVERSED_BITS))
+		bits._last = 4 * numDigits - 1
+		return bits
+
+	def __len__(self):
+		return self._last - self._first + 1
+
+	def __iter__(self):
+		for i in range(self._first, self._last + 1):
+			yield self[i]
+
+	def __contains__(self, item):
+		return self.count(item) > 0
+
+	def __str__(self):
+		return (''.join([str(self[i]) for i in range(self._first, 0)])
+		        + " | " + ''.join([str(self[i]) for i in range(0, self._last + 1)]))
+
+	def _reserve(self, i):
+		'''Grow storage such that it contains index i'''
+		pos = self._offset + i
+		if pos < 0:
+			num = max((7 - pos) // 8, len(self.data), self.MIN_GROWTH)
+			self.data[0:0] = bytes(num)
+			self._offset += 8 * num
+		elif pos >= 8 * len(self.data):
+			num = max(pos // 8 - len(self.data) + 1, len(self.data), self.MIN_GROWTH)
+			self.data += bytes(num)
 
 	def __getitem__(self, i):
-		arm, internalIndex = self._getArm(i)
-		return arm[internalIndex]
+		pos = self._offset + i
+		if (pos < 0) or (pos >= 8 * len(self.data)):
+			return 0
+		return (self.data[pos >> 3] >> (pos & 7)) & 1
 
 	def __setitem__(self, i, val):
-		arm, internalIndex = self._getArm(i)
-		arm[internalIndex] = val
+		if not (self._first <= i <= self._last):
+			self._reserve(i)
+			self._first = min(self._first, i)
+			self._last = max(self._last, i)
+		pos = self._offset + i
+		if val:
+			self.data[pos >> 3] |= 1 << (pos & 7)
+		else:
+			self.data[pos >> 3] &= ~(1 << (pos & 7))
 
 	def borders(self):
-		return -len(self._negArm), len(self._posArm) - 1
+		return self._first, self._last
+
+	def toInt(self):
+		'''Return bits as int and the index of its least significant bit'''
+		return int.from_bytes(self.data, 'little'), -self._offset
+
+	@classmethod
+	def fromInt(cls, value, lowestIndex=0):
+		'''Make BitList from the bits of non-negative int value with the least significant one at lowestIndex'''
+		bits = cls()
+		# Keep offset a multiple of 8
+		shift = lowestIndex % 8
+		value <<= shift
+		lowestIndex -= shift
+		bits.data = bytearray(value.to_bytes((value.bit_length() + 7) // 8, 'little'))
+		bits._offset = -lowestIndex
+		if value:
+			bits._first = min(0, lowestIndex + (value & -value).bit_length() - 1)
+			bits._last = max(-1, lowestIndex + value.bit_length() - 1)
+		return bits
+
+	def popcount(self):
+		'''Return number of set bits'''
+		return int.from_bytes(self.data, 'little').bit_count()
+
+	def count(self, value):
+		'''Return number of bits equal to value within the borders'''
+		if value == 1:
+			return self.popcount()
+		if value == 0:
+			return len(self) - self.popcount()
+		return 0
+
+	def _combine(self, other, operation):
+		'''Return new BitList of operation on both operands' bits aligned by index'''
+		value, lowestIndex = self.toInt()
+		otherValue, otherLowestIndex = other.toInt()
+		if lowestIndex > otherLowestIndex:
+			value <<= lowestIndex - otherLowestIndex
+			lowestIndex = otherLowestIndex
+		else:
+			otherValue <<= otherLowestIndex - lowestIndex
+		result = BitList.fromInt(operation(value, otherValue), lowestIndex)
+		result._first = min(self._first, other._first, result._first)
+		result._last = max(self._last, other._last, result._last)
+		return result
+
+	def __and__(self, other):
+		return self._combine(other, int.__and__)
+
+	def __or__(self, other):
+		return self._combine(other, int.__or__)
+
+	def __xor__(self, other):
+		return self._combine(other, int.__xor__)
+
+
+@functools.lru_cache(maxsize=None)
+def mooreNeighborhood(dims):
+	'''Return offsets of all neighbors including diagonal ones in dims dimensions'''
+	return tuple(offset for offset in itertools.product((-1, 0, 1), repeat=dims) if any(offset))
+
 
+@functools.lru_cache(maxsize=None)
+def neighborhoodRadius(offsets):
+	'''Return the largest distance in any direction of the neighbor offsets'''
+	return max(max(abs(dx), abs(dy)) for dx, dy in offsets)
 
-class InfiniteGrid(DeInfiniteList):
-	'''2D array growing infinitely in any direction
+
+@functools.lru_cache(maxsize=None)
+def _flatOffsets(offsets, width):
+	'''Convert neighbor offsets into offsets within a flat array with rows of width elements'''
+	return tuple(dx * width + dy for dx, dy in offsets)
+
+
+class GridBase:
+	'''Common interface of 2D arrays growing infinitely in any direction
+
+	Elements are accessed either like nested lists by grid[x][y] or faster
+	by grid[x, y]. Derived classes implement element access by tuples in
+	__getitem__() and __setitem__(), and keep _xBorders and _yBorders up to
+	date.
 
 	If used as an iterator iteration goes through entire
 	rows (first index), such that a nested iteration is
 	required to go through row elements. This is like
-	regular nested lists.
+	regular nested lists. All rows span the same range
+	of second indices written so far in any row.
 	
 	For convenience elementsIter() iterates directly
 	through all elements.
+
+	Derived classes may keep valueCounts, which maps every value differing
+	from the default on its number of occurrences. count() and the in
+	operator take constant time then.
+
+	Neighborhoods are given as sequences of offsets (dx, dy) like
+	MOORE_NEIGHBORHOOD. neighbors() and neighborsSum() query the neighborhood
+	of a single element, while stencil() and convolve() process the
+	neighborhoods of all elements within the borders at once. The latter
+	copy the region into a flat list and work on it by index offsets.
 	'''
 
-	def __init__(self, default=0):
-		super().__init__(DeInfiniteList(default))
+	class Row:
+		'''Row of a grid with fixed first index, which supports grid[x][y]'''
+
+		def __init__(self, grid, x):
+			self.grid = grid
+			self.x = x
+
+		def __getitem__(self, y):
+			return self.grid[self.x, y]
+
+		def __setitem__(self, y, val):
+			self.grid[self.x, y] = val
+
+		def __len__(self):
+			first, last = self.grid._yBorders
+			return last - first + 1
+
+		def __iter__(self):
+			first, last = self.grid._yBorders
+			for y in range(first, last + 1):
+				yield self.grid[self.x, y]
+
+		def __contains__(self, item):
+			return item in iter(self)
+
+		def __str__(self):
+			first, last = self.grid._yBorders
+			return (', '.join([str(self[y]) for y in range(first, 0)])
+			        + " | " + ', '.join([str(self[y]) for y in range(0, last + 1)]))
+
+	def __init__(self, default, countValues=False):
+		assert not countValues or isImmutable(default), "counting values requires an immutable default"
+		self.default = default
+		self.valueCounts = {} if countValues else None
+		# Ranges of indices written so far like DeInfiniteList.borders()
+		self._xBorders = (0, -1)
+		self._yBorders = (0, -1)
+
+	def _extendBorders(self, x, y=None):
+		'''Extend ranges of written indices to x and y if given'''
+		self._xBorders = (min(self._xBorders[0], x), max(self._xBorders[1], x))
+		if y is not None:
+			self._yBorders = (min(self._yBorders[0], y), max(self._yBorders[1], y))
+
+	def __len__(self):
+		first, last = self._xBorders
+		return last - first + 1
+
+	def __iter__(self):
+		first, last = self._xBorders
+		for x in range(first, last + 1):
+			yield self.Row(self, x)
 
 	def __contains__(self, item):
-		return any(item in row for row in super().__iter__())
+		if self.valueCounts is not None:
+			return self.count(item) > 0
+		return item in self.elementsIter()
+
+	def count(self, value):
+		'''Return number of elements equal to value within the borders'''
+		if self.valueCounts is not None:
+			first, last = self._yBorders
+			return _countValue(self.valueCounts, self.default, len(self) * (last - first + 1), value)
+		return sum(1 for e in self.elementsIter() if e == value)
+
+	def borders(self):
+		'''Return bounding box of the elements written so far as ((xFirst, xLast), (yFirst, yLast))'''
+		return self._xBorders, self._yBorders
 
 	def elementsIter(self):
 		"Return an iterator iterating over single elements instead of entire rows"
@@ -111,6 +548,587 @@ class InfiniteGrid(DeInfiniteList):
 				yield elem
 
 	def __str__(self):
-		return ('\n    '.join([str(e) for e in reversed(self._negArm)])
-	                 + "\n------\n    " + '\n    '.join([str(e) for e in self._posArm]))
+		first, last = self._xBorders
+		return ('\n    '.join([str(self[x]) for x in range(first, 0)])
+		        + "\n------\n    " + '\n    '.join([str(self[x]) for x in range(0, last + 1)]))
+
+	def _emptyCopy(self, default):
+		'''Return new empty grid of the same kind with another default'''
+		return type(self)(default)
+
+	def _region(self, xFirst, xLast, yFirst, yLast):
+		'''Return elements of a rectangle as flat list row by row'''
+		return [self[x, y] for x in range(xFirst, xLast + 1) for y in range(yFirst, yLast + 1)]
+
+	def _setRegion(self, xFirst, yFirst, width, values):
+		'''Set elements of a rectangle at xFirst, yFirst from flat values with rows of width elements'''
+		for i, val in enumerate(values):
+			self[xFirst + i // width, yFirst + i % width] = val
+
+	def _numpyType(self):
+		'''Return numpy dtype for the elements or None to let numpy choose'''
+		return None
+
+	def view(self, xFirst=None, xLast=None, yFirst=None, yLast=None, copy=True):
+		'''Return the elements of a rectangle as 2D array indexed by [x - xFirst, y - yFirst]
+
+		The rectangle includes its borders and defaults to the bounding box.
+		Returns a numpy array if numpy is available or else a list of rows.
+		The result is a copy. Derived classes may return a view of their
+		storage if copy is False and raise a ValueError if they cannot.
+		'''
+		if not copy:
+			raise ValueError("{} cannot provide a view without copying".format(type(self).__name__))
+		xFirst = self._xBorders[0] if xFirst is None else xFirst
+		xLast = self._xBorders[1] if xLast is None else xLast
+		yFirst = self._yBorders[0] if yFirst is None else yFirst
+		yLast = self._yBorders[1] if yLast is None else yLast
+		height = max(0, xLast - xFirst + 1)
+		width = max(0, yLast - yFirst + 1)
+		values = self._region(xFirst, xLast, yFirst, yLast)
+		if numpy is not None:
+			return numpy.array(values, dtype=self._numpyType()).reshape(height, width)
+		return [values[i * width:(i + 1) * width] for i in range(height)]
+
+	def neighbors(self, x, y, offsets=MOORE_NEIGHBORHOOD):
+		'''Return list of the neighbors of element x, y'''
+		return [self[x + dx, y + dy] for dx, dy in offsets]
+
+	def neighborsSum(self, x, y, offsets=MOORE_NEIGHBORHOOD):
+		'''Return sum of the neighbors of element x, y'''
+		return sum(self.neighbors(x, y, offsets))
+
+	def _paddedRegion(self, padding):
+		'''Return borders of output region, its size, and flat input region padded by padding twice
+
+		The output region covers all elements within the borders and padding
+		around them.
+		'''
+		(xFirst, xLast), (yFirst, yLast) = self._xBorders, self._yBorders
+		xFirst, xLast, yFirst, yLast = xFirst - padding, xLast + padding, yFirst - padding, yLast + padding
+		values = self._region(xFirst - padding, xLast + padding, yFirst - padding, yLast + padding)
+		return xFirst, yFirst, xLast - xFirst + 1, yLast - yFirst + 1, values
+
+	def stencil(self, function, offsets=MOORE_NEIGHBORHOOD):
+		'''Return new grid of function(element, neighbors) for all elements
+
+		The new grid covers all elements whose neighborhood reaches into
+		the borders. Its default is the function's result for the default.
+		'''
+		# Hashable for the cached offset computations
+		offsets = tuple(offsets)
+		result = self._emptyCopy(function(self.default, [self.default] * len(offsets)))
+		if (self._xBorders[0] > self._xBorders[1]) or (self._yBorders[0] > self._yBorders[1]):
+			return result
+		radius = neighborhoodRadius(offsets)
+		xFirst, yFirst, height, width, values = self._paddedRegion(radius)
+		inWidth = width + 2 * radius
+		flatOffsets = _flatOffsets(offsets, inWidth)
+		outValues = []
+		for row in range(height):
+			start = (row + radius) * inWidth + radius
+			for pos in range(start, start + width):
+				outValues.append(function(values[pos], [values[pos + d] for d in flatOffsets]))
+		result._setRegion(xFirst, yFirst, width, outValues)
+		return result
+
+	def convolve(self, kernel):
+		'''Return new grid of weighted sums of the neighborhoods of all elements
+
+		kernel maps offsets (dx, dy) on weights and may include (0, 0) for
+		the element itself. The new grid covers all elements whose
+		neighborhood reaches into the borders. Uses numpy if available.
+		'''
+		offsets = tuple(kernel)
+		weights = [kernel[offset] for offset in offsets]
+		result = self._emptyCopy(sum(w * self.default for w in weights))
+		if (self._xBorders[0] > self._xBorders[1]) or (self._yBorders[0] > self._yBorders[1]):
+			return result
+		radius = neighborhoodRadius(offsets)
+		xFirst, yFirst, height, width, values = self._paddedRegion(radius)
+		inWidth = width + 2 * radius
+		if numpy is not None:
+			matrix = numpy.array(values).reshape(height + 2 * radius, inWidth)
+			outMatrix = sum(w * matrix[radius + dx:radius + dx + height, radius + dy:radius + dy + width]
+			                for (dx, dy), w in zip(offsets, weights))
+			outValues = outMatrix.ravel().tolist()
+		else:
+			weightedOffsets = list(zip(_flatOffsets(offsets, inWidth), weights))
+			outValues = []
+			for row in range(height):
+				start = (row + radius) * inWidth + radius
+				for pos in range(start, start + width):
+					outValues.append(sum(w * values[pos + d] for d, w in weightedOffsets))
+		result._setRegion(xFirst, yFirst, width, outValues)
+		return result
+
+
+class InfiniteGrid(GridBase):
+	'''2D array growing infinitely in any direction with dense storage
+
+	The storage is tiled into square chunks of GRID_CHUNK_SIZE x
+	GRID_CHUNK_SIZE elements, which are created on first write and kept in a
+	dict mapping chunk coordinates on the chunk. Each chunk is a flat list,
+	or array.array if a typecode is given.
+
+	Only writes create chunks. Reading an element of a missing chunk
+	returns the default, unless materializeOnRead is set. Mutable defaults
+	are always stored on reading, because the caller may modify them.
+	Materializing reads extend the borders like writes.
+
+	If countValues is set, valueCounts is kept up to date on every write.
+	'''
+
+	def __init__(self, default=0, typecode=None, materializeOnRead=False, countValues=False):
+		super().__init__(default, countValues)
+		self.typecode = typecode
+		self.materializeOnRead = materializeOnRead or not isImmutable(default)
+		self.chunks = {}
+
+	def _emptyCopy(self, default):
+		# No typecode, as the new elements need not fit into the typecode of this grid
+		return InfiniteGrid(default, None, self.materializeOnRead, self.valueCounts is not None)
+
+	def _newChunk(self, chunkKey):
+		'''Create chunk with default elements at chunkKey and return it'''
+		numElements = GRID_CHUNK_SIZE * GRID_CHUNK_SIZE
+		if self.typecode is not None:
+			chunk = array.array(self.typecode, [self.default]) * numElements
+		elif isImmutable(self.default):
+			chunk = [self.default] * numElements
+		else:
+			chunk = [copy.deepcopy(self.default) for i in range(numElements)]
+		self.chunks[chunkKey] = chunk
+		return chunk
+
+	def _locate(self, x, y):
+		'''Return chunk and position within chunk of element x, y'''
+		chunk = self.chunks.get((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+		if chunk is None:
+			chunk = self._newChunk((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+		xFirst, xLast = self._xBorders
+		yFirst, yLast = self._yBorders
+		if not ((xFirst <= x <= xLast) and (yFirst <= y <= yLast)):
+			self._extendBorders(x, y)
+		return chunk, ((x & GRID_CHUNK_MASK) << GRID_CHUNK_BITS) | (y & GRID_CHUNK_MASK)
+
+	def __getitem__(self, key):
+		if type(key) is not tuple:
+			if self.materializeOnRead:
+				xFirst, xLast = self._xBorders
+				if not (xFirst <= key <= xLast):
+					self._extendBorders(key)
+			return self.Row(self, key)
+		if self.materializeOnRead:
+			chunk, pos = self._locate(*key)
+			return chunk[pos]
+		x, y = key
+		chunk = self.chunks.get((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+		if chunk is None:
+			return self.default
+		return chunk[((x & GRID_CHUNK_MASK) << GRID_CHUNK_BITS) | (y & GRID_CHUNK_MASK)]
+
+	def __setitem__(self, key, val):
+		'''Set single element, key must be a tuple x, y'''
+		# Inlined _locate() as this is one of the most frequent operations
+		x, y = key
+		chunk = self.chunks.get((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+		if chunk is None:
+			chunk = self._newChunk((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+		xFirst, xLast = self._xBorders
+		yFirst, yLast = self._yBorders
+		if not ((xFirst <= x <= xLast) and (yFirst <= y <= yLast)):
+			self._extendBorders(x, y)
+		pos = ((x & GRID_CHUNK_MASK) << GRID_CHUNK_BITS) | (y & GRID_CHUNK_MASK)
+		if (self.valueCounts is not None) and (chunk[pos] != val):
+			_updateValueCounts(self.valueCounts, self.default, chunk[pos], val)
+		chunk[pos] = val
+
+
+	def _numpyType(self):
+		return None if self.typecode is None else numpy.dtype(self.typecode)
+
+	def view(self, xFirst=None, xLast=None, yFirst=None, yLast=None, copy=True):
+		'''Return the elements of a rectangle as 2D array indexed by [x - xFirst, y - yFirst]
+
+		Like GridBase.view(), but if copy is False the result refers to the
+		storage without copying, so writing to it changes the grid. It is a
+		numpy array then, or without numpy a list of memoryviews of the rows.
+		This requires a typecode and the rectangle to lie within a single
+		existing chunk, which are aligned to multiples of GRID_CHUNK_SIZE, and
+		raises a TypeError or ValueError otherwise.
+		'''
+		if copy:
+			return super().view(xFirst, xLast, yFirst, yLast)
+		if self.typecode is None:
+			raise TypeError("view() without copying requires an InfiniteGrid with typecode")
+		xFirst = self._xBorders[0] if xFirst is None else xFirst
+		xLast = self._xBorders[1] if xLast is None else xLast
+		yFirst = self._yBorders[0] if yFirst is None else yFirst
+		yLast = self._yBorders[1] if yLast is None else yLast
+		chunkKey = (xFirst >> GRID_CHUNK_BITS, yFirst >> GRID_CHUNK_BITS)
+		chunk = self.chunks.get(chunkKey)
+		if ((chunk is not None) and (xFirst <= xLast) and (yFirst <= yLast)
+		    and (chunkKey == (xLast >> GRID_CHUNK_BITS, yLast >> GRID_CHUNK_BITS))):
+			xInChunk = xFirst & GRID_CHUNK_MASK
+			yInChunk = yFirst & GRID_CHUNK_MASK
+			height = xLast - xFirst + 1
+			width = yLast - yFirst + 1
+			if numpy is not None:
+				matrix = numpy.frombuffer(chunk, dtype=self.typecode).reshape(GRID_CHUNK_SIZE, GRID_CHUNK_SIZE)
+				return matrix[xInChunk:xInChunk + height, yInChunk:yInChunk + width]
+			chunkView = memoryview(chunk)
+			return [chunkView[((xInChunk + i) << GRID_CHUNK_BITS) + yInChunk:((xInChunk + i) << GRID_CHUNK_BITS) + yInChunk + width]
+			        for i in range(height)]
+		raise ValueError("view() without copying requires a rectangle within a single existing chunk")
+
+	def neighbors(self, x, y, offsets=MOORE_NEIGHBORHOOD):
+		# Hashable for the cached offset computations
+		offsets = tuple(offsets)
+		xInChunk = x & GRID_CHUNK_MASK
+		yInChunk = y & GRID_CHUNK_MASK
+		radius = neighborhoodRadius(offsets)
+		# Neighborhood within a single chunk?
+		if (radius <= xInChunk < GRID_CHUNK_SIZE - radius) and (radius <= yInChunk < GRID_CHUNK_SIZE - radius):
+			chunk = self.chunks.get((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+			if chunk is not None:
+				pos = (xInChunk << GRID_CHUNK_BITS) | yInChunk
+				return [chunk[pos + d] for d in _flatOffsets(offsets, GRID_CHUNK_SIZE)]
+		return super().neighbors(x, y, offsets)
+
+	def _region(self, xFirst, xLast, yFirst, yLast):
+		result = []
+		for x in range(xFirst, xLast + 1):
+			rowStart = (x & GRID_CHUNK_MASK) << GRID_CHUNK_BITS
+			y = yFirst
+			# Copy the row's parts within each chunk at once
+			while y <= yLast:
+				partLast = min(yLast, y | GRID_CHUNK_MASK)
+				chunk = self.chunks.get((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+				if (chunk is None) and self.materializeOnRead:
+					chunk = self._newChunk((x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS))
+				if chunk is None:
+					result += [self.default] * (partLast - y + 1)
+				else:
+					result += chunk[rowStart + (y & GRID_CHUNK_MASK):rowStart + (partLast & GRID_CHUNK_MASK) + 1]
+				y = partLast + 1
+		return result
+
+	def _setRegion(self, xFirst, yFirst, width, values):
+		height = len(values) // width
+		if height == 0:
+			return
+		for row in range(height):
+			x = xFirst + row
+			rowStart = (x & GRID_CHUNK_MASK) << GRID_CHUNK_BITS
+			y = yFirst
+			yLast = yFirst + width - 1
+			while y <= yLast:
+				partLast = min(yLast, y | GRID_CHUNK_MASK)
+				part = values[row * width + y - yFirst:row * width + partLast - yFirst + 1]
+				chunkKey = (x >> GRID_CHUNK_BITS, y >> GRID_CHUNK_BITS)
+				chunk = self.chunks.get(chunkKey)
+				# Do not create chunks just to store defaults
+				if (chunk is not None) or any(v != self.default for v in part):
+					if chunk is None:
+						chunk = self._newChunk(chunkKey)
+					if self.valueCounts is not None:
+						oldPart = chunk[rowStart + (y & GRID_CHUNK_MASK):rowStart + (partLast & GRID_CHUNK_MASK) + 1]
+						for oldVal, newVal in zip(oldPart, part):
+							_updateValueCounts(self.valueCounts, self.default, oldVal, newVal)
+					if self.typecode is not None:
+						part = array.array(self.typecode, part)
+					chunk[rowStart + (y & GRID_CHUNK_MASK):rowStart + (partLast & GRID_CHUNK_MASK) + 1] = part
+				y = partLast + 1
+		self._extendBorders(xFirst, yFirst)
+		self._extendBorders(xFirst + height - 1, yFirst + width - 1)
+
+
+
+def packSparseKey(x, y):
+	'''Pack grid indices x, y into a single int, y must fit SPARSE_Y_BITS as signed int'''
+	return (x << SPARSE_Y_BITS) | (y & SPARSE_Y_MASK)
+
+
+def unpackSparseKey(key):
+	'''Inverse of packSparseKey()'''
+	y = key & SPARSE_Y_MASK
+	if y >> (SPARSE_Y_BITS - 1):
+		# Restore sign of negative y
+		y -= 1 << SPARSE_Y_BITS
+	return key >> SPARSE_Y_BITS, y
+
+
+class SparseGrid(GridBase):
+	'''2D array growing infinitely in any direction with sparse storage
+
+	Has the same interface as InfiniteGrid, but stores only elements
+	differing from the default in a dict. The keys are made by
+	packSparseKey() from both indices, which is faster than tuple keys.
+	Second indices must fit into a signed int of SPARSE_Y_BITS bits,
+	otherwise accessing them raises a ValueError. Writing the default removes the element without extending the
+	borders. This needs much less memory
+	than InfiniteGrid if only few and scattered elements are set.
+
+	Mutable defaults are stored on reading, because the caller may modify
+	them.
+
+	If countValues is set, valueCounts is kept up to date on every write.
+	The parameters match those of InfiniteGrid to swap the classes easily,
+	but typecode and materializeOnRead are ignored.
+	'''
+
+	def __init__(self, default=0, typecode=None, materializeOnRead=False, countValues=False):
+		super().__init__(default, countValues)
+		self.cells = {}
+		self._mutableDefault = not isImmutable(default)
+
+	def __getitem__(self, key):
+		if type(key) is not tuple:
+			return self.Row(self, key)
+		x, y = key
+		if not (-SPARSE_Y_LIMIT <= y < SPARSE_Y_LIMIT):
+			raise ValueError("Second index {} out of range of SparseGrid".format(y))
+		packedKey = (x << SPARSE_Y_BITS) | (y & SPARSE_Y_MASK)
+		val = self.cells.get(packedKey, self)
+		if val is self:
+			# Using self as marker for missing elements as None may be a stored value
+			if not self._mutableDefault:
+				return self.default
+			val = copy.deepcopy(self.default)
+			self[key] = val
+		return val
+
+	def __setitem__(self, key, val):
+		'''Set single element, key must be a tuple x, y'''
+		x, y = key
+		if not (-SPARSE_Y_LIMIT <= y < SPARSE_Y_LIMIT):
+			raise ValueError("Second index {} out of range of SparseGrid".format(y))
+		packedKey = (x << SPARSE_Y_BITS) | (y & SPARSE_Y_MASK)
+		if self.valueCounts is not None:
+			_updateValueCounts(self.valueCounts, self.default, self.cells.get(packedKey, self.default), val)
+		if (val == self.default) and not self._mutableDefault:
+			self.cells.pop(packedKey, None)
+			return
+		self.cells[packedKey] = val
+		xFirst, xLast = self._xBorders
+		yFirst, yLast = self._yBorders
+		if not ((xFirst <= x <= xLast) and (yFirst <= y <= yLast)):
+			self._extendBorders(x, y)
+
+	def _emptyCopy(self, default):
+		return SparseGrid(default, countValues=self.valueCounts is not None)
+
+	def _region(self, xFirst, xLast, yFirst, yLast):
+		if self._mutableDefault:
+			return super()._region(xFirst, xLast, yFirst, yLast)
+		get = self.cells.get
+		return [get((x << SPARSE_Y_BITS) | (y & SPARSE_Y_MASK), self.default)
+		        for x in range(xFirst, xLast + 1) for y in range(yFirst, yLast + 1)]
+
+	def itemsIter(self):
+		'''Return an iterator over ((x, y), value) of all stored elements in arbitrary order'''
+		for packedKey, val in self.cells.items():
+			yield unpackSparseKey(packedKey), val
+
+
+class BitGrid(GridBase):
+	'''2D array of bits growing infinitely in any direction
+
+	Has the same interface as InfiniteGrid with default 0, but stores each
+	row as BitList in the dict rows. Rows may be set entirely by setRow(),
+	e.g. from BitList.fromHex() or bitwise operations of other rows.
+	stencil() and convolve() return an InfiniteGrid as their results are
+	rarely bits.
+	'''
+
+	def __init__(self):
+		super().__init__(0)
+		self.rows = {}
+
+	def __getitem__(self, key):
+		if type(key) is not tuple:
+			return self.Row(self, key)
+		x, y = key
+		row = self.rows.get(x)
+		if row is None:
+			return 0
+		return row[y]
+
+	def __setitem__(self, key, val):
+		'''Set single element, key must be a tuple x, y'''
+		x, y = key
+		row = self.rows.get(x)
+		if row is None:
+			row = self.rows[x] = BitList()
+		row[y] = val
+		xFirst, xLast = self._xBorders
+		yFirst, yLast = self._yBorders
+		if not ((xFirst <= x <= xLast) and (yFirst <= y <= yLast)):
+			self._extendBorders(x, y)
+
+	def _emptyCopy(self, default):
+		return InfiniteGrid(default)
+
+	def rowBits(self, x):
+		'''Return BitList of row x, which is empty and not part of the grid if the row was never written'''
+		row = self.rows.get(x)
+		return BitList() if row is None else row
+
+	def setRow(self, x, bits):
+		'''Replace row x by BitList bits'''
+		self.rows[x] = bits
+		self._extendBorders(x)
+		if len(bits) > 0:
+			self._extendBorders(x, bits._first)
+			self._extendBorders(x, bits._last)
+
+	def popcount(self):
+		'''Return number of set bits'''
+		return sum(row.popcount() for row in self.rows.values())
+
+	def count(self, value):
+		'''Return number of bits equal to value within the borders'''
+		if value == 1:
+			return self.popcount()
+		if value == 0:
+			first, last = self._yBorders
+			return len(self) * (last - first + 1) - self.popcount()
+		return 0
+
+	def __contains__(self, item):
+		return self.count(item) > 0
+
+
+class InfiniteNDGrid:
+	'''Array of dims dimensions growing infinitely in any direction
+
+	Elements are accessed by tuples of dims indices like grid[x, y, z]. The
+	storage is tiled into hypercube chunks with edges of 2**chunkBits
+	elements, where chunkBits is chosen such that a chunk has at most
+	2**ND_CHUNK_ELEMENT_BITS elements. With more than ND_CHUNK_ELEMENT_BITS
+	dimensions chunkBits is 0, so each chunk is a single element. Chunks are
+	created on first write and kept in a dict mapping chunk coordinates on
+	the chunk. Each chunk is a flat list, or array.array if a typecode is
+	given, with the last index varying fastest.
+
+	Reading elements, materializeOnRead, and countValues work like for
+	InfiniteGrid. borders() is the bounding box of the elements written so
+	far. Iteration by chunksIter(), items(), and elementsIter() only visits
+	chunks which have been created.
+	'''
+
+	def __init__(self, dims, default=0, typecode=None, materializeOnRead=False, countValues=False):
+		assert dims >= 1, "grid needs at least one dimension"
+		assert not countValues or isImmutable(default), "counting values requires an immutable default"
+		self.dims = dims
+		self.default = default
+		self.typecode = typecode
+		self.materializeOnRead = materializeOnRead or not isImmutable(default)
+		self.valueCounts = {} if countValues else None
+		self.chunkBits = ND_CHUNK_ELEMENT_BITS // dims
+		self._chunkMask = (1 << self.chunkBits) - 1
+		self.chunks = {}
+		# Range of indices written so far per dimension like DeInfiniteList.borders()
+		self._borders = [(0, -1)] * dims
+
+	def _newChunk(self, chunkKey):
+		'''Create chunk with default elements at chunkKey and return it'''
+		numElements = 1 << (self.chunkBits * self.dims)
+		if self.typecode is not None:
+			chunk = array.array(self.typecode, [self.default]) * numElements
+		elif isImmutable(self.default):
+			chunk = [self.default] * numElements
+		else:
+			chunk = [copy.deepcopy(self.default) for i in range(numElements)]
+		self.chunks[chunkKey] = chunk
+		return chunk
+
+	def _position(self, key):
+		'''Return key of the chunk containing element key and the position within the chunk'''
+		assert len(key) == self.dims, "index needs {} components".format(self.dims)
+		bits = self.chunkBits
+		mask = self._chunkMask
+		pos = 0
+		for i in key:
+			pos = (pos << bits) | (i & mask)
+		return tuple([i >> bits for i in key]), pos
+
+	def _extendBorders(self, key):
+		'''Extend bounding box to element key'''
+		self._borders = [(min(first, i), max(last, i)) for (first, last), i in zip(self._borders, key)]
+
+	def _locate(self, key):
+		'''Return chunk and position within chunk of element key creating the chunk if necessary'''
+		chunkKey, pos = self._position(key)
+		chunk = self.chunks.get(chunkKey)
+		if chunk is None:
+			chunk = self._newChunk(chunkKey)
+		for (first, last), i in zip(self._borders, key):
+			if not (first <= i <= last):
+				self._extendBorders(key)
+				break
+		return chunk, pos
+
+	def __getitem__(self, key):
+		if self.materializeOnRead:
+			chunk, pos = self._locate(key)
+			return chunk[pos]
+		chunkKey, pos = self._position(key)
+		chunk = self.chunks.get(chunkKey)
+		if chunk is None:
+			return self.default
+		return chunk[pos]
+
+	def __setitem__(self, key, val):
+		chunk, pos = self._locate(key)
+		if (self.valueCounts is not None) and (chunk[pos] != val):
+			_updateValueCounts(self.valueCounts, self.default, chunk[pos], val)
+		chunk[pos] = val
+
+	def __contains__(self, item):
+		return self.count(item) > 0
+
+	def borders(self):
+		'''Return bounding box of the elements written so far as (first, last) per dimension'''
+		return tuple(self._borders)
+
+	def volume(self):
+		'''Return number of elements within the borders'''
+		volume = 1
+		for first, last in self._borders:
+			volume *= max(0, last - first + 1)
+		return volume
+
+	def count(self, value):
+		'''Return number of elements equal to value within the borders'''
+		if self.valueCounts is not None:
+			return _countValue(self.valueCounts, self.default, self.volume(), value)
+		if value == self.default:
+			return self.volume() - sum(1 for e in self.elementsIter() if e != self.default)
+		return sum(1 for e in self.elementsIter() if e == value)
+
+	def chunksIter(self):
+		'''Return an iterator over (index of first element, chunk) of all created chunks'''
+		for chunkKey, chunk in self.chunks.items():
+			yield tuple([c << self.chunkBits for c in chunkKey]), chunk
+
+	def items(self):
+		'''Return an iterator over (index, element) of all elements of the created chunks'''
+		edge = 1 << self.chunkBits
+		for firstIndex, chunk in self.chunksIter():
+			yield from zip(itertools.product(*[range(i, i + edge) for i in firstIndex]), chunk)
+
+	def elementsIter(self):
+		"Return an iterator over all elements of the created chunks"
+		return itertools.chain.from_iterable(self.chunks.values())
+
+	def neighbors(self, key, offsets=None):
+		'''Return list of the neighbors of element key, offsets default to the Moore neighborhood'''
+		if offsets is None:
+			offsets = mooreNeighborhood(self.dims)
+		return [self[tuple([i + d for i, d in zip(key, offset)])] for offset in offsets]
 
+	def neighborsSum(self, key, offsets=None):
+		'''Return sum of the neighbors of element key'''
+		return sum(self.neighbors(key, offsets))
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+'''
+Author: Björn Hendriks
+
+See http://adventofcode.com
+
+Persistent cache for parsed puzzle inputs
+
+Parsing and converting large inputs may take longer than solving the puzzle
+itself. This cache stores the results of Input.getInputLines() and
+Input.getInputLists() on disk, keyed by a hash of the input file's content
+plus the separator and conversion used. Lists of ints are packed into
+arrays, everything else is pickled. If the cache exceeds its size limit the
+least recently used entries are removed.
+'''
+
+
+import array
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+# Number of bytes read at once to compute the content hash
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Range of ints which fit into the packed array type
+_PACKED_MIN = -(1 << 63)
+_PACKED_MAX = (1 << 63) - 1
+
+
+def contentHash(fileObject):
+	'''Compute hash of the entire content of a binary file object'''
+	hash = hashlib.sha256()
+	for chunk in iter(lambda: fileObject.read(HASH_CHUNK_SIZE), b''):
+		hash.update(chunk)
+	return hash.hexdigest()
+
+
+def _codeFingerprint(code):
+	'''Return bytes identifying bytecode, names, and constants of a code object and its nested code objects'''
+	parts = [code.co_code, repr(code.co_names).encode()]
+	for const in code.co_consts:
+		# The repr of code objects contains their address, which changes with each run
+		parts.append(_codeFingerprint(const) if hasattr(const, 'co_code') else repr(const).encode())
+	return b'\0'.join(parts)
+
+
+def _isPackable(values):
+	return all(type(v) is int and _PACKED_MIN <= v <= _PACKED_MAX for v in values)
+
+
+def _pack(kind, value):
+	'''Pack lines or lists of ints into arrays, leave anything else as it is'''
+	if kind == 'lines' and _isPackable(value):
+		return ('packedLines', array.array('q', value))
+	if kind == 'lists' and all(_isPackable(l) for l in value):
+		lengths = array.array('q', map(len, value))
+		flat = array.array('q')
+		for l in value:
+			flat.extend(l)
+		return ('packedLists', lengths, flat)
+	return ('pickled', value)
+
+
+def _unpack(packed):
+	'''Inverse of _pack()'''
+	if packed[0] == 'packedLines':
+		return packed[1].tolist()
+	if packed[0] == 'packedLists':
+		lengths, flat = packed[1], packed[2].tolist()
+		result = []
+		start = 0
+		for length in lengths:
+			result.append(flat[start:start + length])
+			start += length
+		return result
+	return packed[1]
+
+
+class ParsedInputCache:
+	'''Directory of cached parsing results with LRU eviction'''
+
+	def __init__(self, cacheDir, sizeLimit):
+		'''cacheDir: directory to store the cache files in, created if necessary
+		sizeLimit: maximum total size of the cache files in bytes
+		'''
+		self.cacheDir = cacheDir
+		self.sizeLimit = sizeLimit
+
+	@staticmethod
+	def makeKey(contentHash, kind, separator, conversion):
+		'''Make key for parsing result kind ('lines' or 'lists') of an input
+
+		Returns None if conversion cannot be identified reliably across runs,
+		like lambdas or local functions, which means the result is not cached.
+		Functions written in Python are also identified by their code, so
+		editing them invalidates their cached results.
+		'''
+		qualname = getattr(conversion, '__qualname__', None)
+		if (qualname is None) or ('<' in qualname):
+			return None
+		conversionName = "{}.{}".format(getattr(conversion, '__module__', None), qualname)
+		code = getattr(conversion, '__code__', None)
+		if code is not None:
+			conversionName += "@" + hashlib.sha256(_codeFingerprint(code)).hexdigest()
+		keyText = "\n".join([contentHash, kind, repr(separator), conversionName])
+		return hashlib.sha256(keyText.encode()).hexdigest()
+
+	def _path(self, key):
+		return os.path.join(self.cacheDir, key + '.pickle')
+
+	def get(self, key):
+		'''Return cached result for key or None if not available'''
+		path = self._path(key)
+		try:
+			with open(path, 'rb') as cacheFile:
+				packed = pickle.load(cacheFile)
+		except (OSError, pickle.UnpicklingError, EOFError):
+			return None
+		# Update modification time, which serves as last access time for LRU eviction
+		try:
+			os.utime(path)
+		except OSError:
+			# Another process evicted the entry meanwhile, but it is loaded already
+			pass
+		return _unpack(packed)
+
+	def put(self, key, kind, value):
+		'''Store value for key and evict least recently used entries if necessary'''
+		os.makedirs(self.cacheDir, exist_ok=True)
+		# Write to temporary file and move it into place to never leave a partial cache file
+		fd, tempPath = tempfile.mkstemp(dir=self.cacheDir, suffix='.tmp')
+		with os.fdopen(fd, 'wb') as tempFile:
+			pickle.dump(_pack(kind, value), tempFile, protocol=pickle.HIGHEST_PROTOCOL)
+		os.replace(tempPath, self._path(key))
+		self.evict()
+
+	def evict(self):
+		'''Remove least recently used entries until the cache fits into its size limit'''
+		entries = []
+		for entry in os.scandir(self.cacheDir):
+			if entry.is_file() and entry.name.endswith('.pickle'):
+				stat = entry.stat()
+				entries.append((stat.st_mtime, stat.st_size, entry.path))
+		totalSize = sum(size for mtime, size, path in entries)
+		# Oldest entries first
+		for mtime, size, path in sorted(entries):
+			if totalSize <= self.sizeLimit:
+				break
+			try:
+				os.remove(path)
+			except FileNotFoundError:
+				pass
+			totalSize -= size
@@ -6,60 +6,511 @@ See http://adventofcode.com
 '''
 
 
+import array
+import bz2
+import gzip
+import itertools
+import lzma
+import mmap
 import os.path
+import queue
+import re
+import threading
+import warnings
+import helpers.parsedInputCache
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
 
 
 # Adapt this constant to your preferred default input folder
 INPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../input')
 # Adapt this constant to change the filename scheme for input files within INPUT_DIR
 INPUT_NAME_FORMAT = "{year:04d}/day{day:02d}.txt"   # example: '2017/day07.txt'
+# Encoding of input files in all modes, independent of the locale
+INPUT_ENCODING = 'utf-8'
+# Number of characters read at once in streaming mode
+STREAM_CHUNK_SIZE = 64 * 1024
+# Number of chunks decompressed ahead in streaming mode
+PREFETCH_CHUNKS = 4
+# Compressed variants of input files are opened with these functions
+COMPRESSED_FORMATS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+# Adapt these constants to change where and how much parsed input is cached if enabled
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../inputCache')
+CACHE_SIZE_LIMIT = 512 * 1024 * 1024
+# Number of lines parsed at once by Input.asArray()
+ARRAY_BATCH_LINES = 4096
 
 
 class Input:
 	'''Read input of a specific day and provide its content in different forms'''
 
-	def __init__(self, year, day, separator=None, conversion=str, inputDir=INPUT_DIR):
+	def __init__(self, year, day, separator=None, conversion=str, inputDir=INPUT_DIR, memoryMapped=False,
+	             streaming=False, chunkSize=STREAM_CHUNK_SIZE, inputStream=None, replayable=False,
+	             useCache=False):
 		'''Read input and store processing configuration
 
 		separator: split input lines with this separator, None = split at whitespace
 		conversion: apply this function to each line or part of a line if separator given
+		memoryMapped: map the input file into memory instead of reading it, such that
+		              lines are found lazily and no copy of the entire input is made
+		streaming: do not read the input in advance, but read it in chunks of chunkSize
+		           characters while iterating over its lines, so memory stays bounded
+		inputStream: read input from this already opened text stream (e.g. sys.stdin)
+		             instead of the input file, implies streaming. The stream can only
+		             be iterated once, unless replayable is set.
+		replayable: keep the lines read from inputStream to iterate them again, which
+		            takes memory proportional to the entire input
+		useCache: store results of getInputLines() and getInputLists() in CACHE_DIR and
+		          reuse them as long as input, separator, and conversion do not change
+
+		If the input file does not exist, but a compressed variant with one of the
+		extensions of COMPRESSED_FORMATS, that one is decompressed on the fly. A compressed
+		file cannot be memory-mapped, so it is streamed instead. Files are decoded as
+		INPUT_ENCODING in all modes. Use the Input as context manager or call close()
+		to release a memory-mapped file.
 		'''
 		self.separator = separator
 		self.conversion = conversion
+		self.memoryMapped = memoryMapped
+		self.streaming = streaming or (inputStream is not None)
+		self.chunkSize = chunkSize
+		self.inputStream = inputStream
+		self.replayable = replayable
+		assert not (self.memoryMapped and self.streaming)
 		print ("Retrieving input for year {}, day {}".format(year, day))
-		with open(os.path.join(inputDir, INPUT_NAME_FORMAT.format(year=year, day=day))) as inputFile:
+		self.inputPath, self.openFunc = self._findInputFile(
+			os.path.join(inputDir, INPUT_NAME_FORMAT.format(year=year, day=day)))
+		if self.memoryMapped and (self.openFunc is not open):
+			self.memoryMapped = False
+			self.streaming = True
+		# A stream can neither be hashed nor reread, so it is not cached
+		self.parsedCache = None
+		if useCache and (inputStream is None):
+			self.parsedCache = helpers.parsedInputCache.ParsedInputCache(CACHE_DIR, CACHE_SIZE_LIMIT)
+		self._contentHash = None
+		self.input = None
+		if self.memoryMapped:
+			self._mapInput(self.inputPath)
+		elif not (self.streaming or (self.parsedCache is not None)):
+			# With cache the input is read on demand only, because it may not be needed at all
+			self._readInput()
+		# Reader of inputStream and its lines read so far if replayable
+		self._streamReader = None
+		self._streamLines = []
+		self.invalidateCache()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, excType, excValue, traceback):
+		self.close()
+
+	def close(self):
+		'''Release the memory-mapped input file if any
+
+		Memoryviews of rawInputBytesIter() must be released before. The
+		input cannot be accessed anymore afterwards.
+		'''
+		if self.memoryMapped and isinstance(self.mappedInput, mmap.mmap):
+			self.mappedInput.close()
+
+	def invalidateCache(self):
+		'''Drop cached converted lines and lists
+
+		The caches are filled lazily by the get*() methods. Invalidate them
+		after changing separator or conversion. Unconverted lines are never
+		cached, so they do not stay in memory besides the converted ones.
+		'''
+		self._linesCache = None
+		self._listsCache = None
+
+	@staticmethod
+	def _findInputFile(inputPath):
+		'''Return path of input file or of its compressed variant and the function to open it'''
+		if not os.path.exists(inputPath):
+			for extension, openFunc in COMPRESSED_FORMATS.items():
+				if os.path.exists(inputPath + extension):
+					return inputPath + extension, openFunc
+		# Missing input files raise the usual exception when opened
+		return inputPath, open
+
+	def _openInput(self):
+		'''Open input file in text mode decompressing it if necessary'''
+		return self.openFunc(self.inputPath, 'rt', encoding=INPUT_ENCODING)
+
+	def _readInput(self):
+		'''Read entire input'''
+		with self._openInput() as inputFile:
 			self.input = inputFile.read().rstrip()
 
+	def _mapInput(self, inputPath):
+		'''Map input file into memory and find end of input ignoring trailing whitespace'''
+		with open(inputPath, 'rb') as inputFile:
+			try:
+				self.mappedInput = mmap.mmap(inputFile.fileno(), 0, access=mmap.ACCESS_READ)
+			except ValueError:
+				# Empty files cannot be mapped
+				self.mappedInput = b''
+		# Same as rstrip() of the entire input in the regular mode
+		self.mappedEnd = len(self.mappedInput)
+		while (self.mappedEnd > 0) and (self.mappedInput[self.mappedEnd - 1] in b' \t\n\r\v\f'):
+			self.mappedEnd -= 1
+
 	def numInputLines(self):
 		'''Return number of input lines'''
-		return len(self.getInputLines())
+		# Prefer already converted lines, which may come from the persistent cache
+		for cache in (self._linesCache, self._listsCache):
+			if cache is not None:
+				return len(cache)
+		# Count line breaks without splitting the input into lines
+		if self.memoryMapped:
+			return 1 + sum(self.mappedInput[start:min(start + self.chunkSize, self.mappedEnd)].count(b'\n')
+			               for start in range(0, self.mappedEnd, self.chunkSize))
+		if self.streaming:
+			return sum(1 for line in self.rawInputLineIter())
+		if self.input is None:
+			self._readInput()
+		return 1 + self.input.count('\n')
+
+	def rawInputBytesIter(self):
+		'''Yield input lines as memoryview slices of the mapped input file
+
+		Only available if memoryMapped is set. The slices refer to the mapped
+		file directly, so nothing is copied until a slice is converted.
+		'''
+		assert self.memoryMapped
+		view = memoryview(self.mappedInput)
+		start = 0
+		while True:
+			end = self.mappedInput.find(b'\n', start, self.mappedEnd)
+			if end < 0:
+				yield view[start:self.mappedEnd]
+				return
+			# Ignore carriage returns of Windows line endings like the regular mode does
+			lineEnd = end - 1 if (end > start) and (self.mappedInput[end - 1] == ord('\r')) else end
+			yield view[start:lineEnd]
+			start = end + 1
+
+	def _streamLineIter(self):
+		'''Read input stream chunk by chunk and yield its lines
+
+		An input stream given at construction can only be read once. A second
+		iteration raises a ValueError, unless replayable is set, which makes
+		_recordedStreamLineIter() keep the lines. Otherwise the input file is
+		reopened for each iteration.
+		'''
+		if self.replayable and (self.inputStream is not None):
+			yield from self._recordedStreamLineIter()
+		elif self.inputStream is not None:
+			if self._streamReader is not None:
+				raise ValueError("Input stream can only be read once, use replayable=True to read it again")
+			self._streamReader = self._rstripLines(self._chunkedLineIter(self._chunkIter(self.inputStream)))
+			yield from self._streamReader
+		else:
+			with self._openInput() as inputFile:
+				if self.openFunc is open:
+					chunks = self._chunkIter(inputFile)
+				else:
+					chunks = self._prefetchedChunkIter(inputFile)
+				yield from self._rstripLines(self._chunkedLineIter(chunks))
+
+	def _recordedStreamLineIter(self):
+		'''Yield lines of the input stream and record them for further iterations
+
+		All iterations share a single reader of the stream. Lines recorded by
+		earlier iterations are yielded first, the remaining ones are read
+		on demand, so even partial or interleaved iterations see all lines.
+		'''
+		if self._streamReader is None:
+			self._streamReader = self._rstripLines(self._chunkedLineIter(self._chunkIter(self.inputStream)))
+		index = 0
+		while True:
+			while index < len(self._streamLines):
+				yield self._streamLines[index]
+				index += 1
+			# Lines are strings, so None marks the end of the stream
+			line = next(self._streamReader, None)
+			if line is None:
+				return
+			self._streamLines.append(line)
+
+	def _chunkIter(self, stream):
+		'''Yield chunks of self.chunkSize characters read from stream'''
+		return iter(lambda: stream.read(self.chunkSize), '')
+
+	def _prefetchedChunkIter(self, stream):
+		'''Yield chunks of stream read ahead by a background thread
+
+		Decompression releases the GIL, so reading up to PREFETCH_CHUNKS chunks
+		ahead overlaps decompression with processing of the lines read so far.
+		'''
+		chunks = queue.Queue(maxsize=PREFETCH_CHUNKS)
+		stop = threading.Event()
+
+		def readAhead():
+			'''Put chunks into queue until end of stream, error, or stop'''
+			while not stop.is_set():
+				try:
+					chunk = stream.read(self.chunkSize)
+				except Exception as e:
+					chunk = e
+				# Wait for space in the queue, but give up if the consumer stopped
+				while not stop.is_set():
+					try:
+						chunks.put(chunk, timeout=0.1)
+						break
+					except queue.Full:
+						pass
+				if not isinstance(chunk, str) or not chunk:
+					return
+
+		thread = threading.Thread(target=readAhead, daemon=True)
+		thread.start()
+		try:
+			while True:
+				chunk = chunks.get()
+				if isinstance(chunk, Exception):
+					raise chunk
+				if not chunk:
+					return
+				yield chunk
+		finally:
+			# Let reader finish before the stream is closed
+			stop.set()
+			thread.join()
+
+	@staticmethod
+	def _chunkedLineIter(chunks):
+		'''Yield lines of text given as iterable of chunks'''
+		# Pieces of the incomplete last line of the chunks read so far. They are
+		# joined only once the line is complete, as concatenating each new chunk
+		# would copy long lines over and over again.
+		restPieces = []
+		for chunk in chunks:
+			lines = chunk.split('\n')
+			if len(lines) > 1:
+				restPieces.append(lines[0])
+				lines[0] = ''.join(restPieces)
+				restPieces = []
+				yield from lines[:-1]
+			restPieces.append(lines[-1])
+		yield ''.join(restPieces)
+
+	@staticmethod
+	def _rstripLines(lines):
+		'''Yield lines as if rstrip() was applied to their joined text before
+
+		Whitespace-only lines are held back until a following line with
+		content shows that they are not part of the trailing whitespace.
+		The last line with content is held back to strip it at the end.
+		'''
+		lastLine = None
+		blankLines = []
+		for line in lines:
+			if (not line) or line.isspace():
+				blankLines.append(line)
+			else:
+				if lastLine is not None:
+					yield lastLine
+				yield from blankLines
+				lastLine = line
+				blankLines = []
+		yield '' if lastLine is None else lastLine.rstrip()
 
 	def rawInputLineIter(self):
 		'''Yield input lines without conversion'''
-		for line in self.input.split('\n'):
-			yield line
+		if self.streaming:
+			yield from self._streamLineIter()
+		elif self.memoryMapped:
+			for line in self.rawInputBytesIter():
+				yield str(line, INPUT_ENCODING)
+		else:
+			if self.input is None:
+				self._readInput()
+			for line in self.input.split('\n'):
+				yield line
+
+	def _cachedParse(self, kind, parse):
+		'''Return parse() result or load it from the persistent cache if enabled
+
+		kind: 'lines' or 'lists' distinguishes the results of different parse functions
+		'''
+		if self.parsedCache is None:
+			return parse()
+		if self._contentHash is None:
+			with open(self.inputPath, 'rb') as inputFile:
+				self._contentHash = helpers.parsedInputCache.contentHash(inputFile)
+		key = self.parsedCache.makeKey(self._contentHash, kind, self.separator, self.conversion)
+		if key is None:
+			return parse()
+		result = self.parsedCache.get(key)
+		if result is None:
+			result = parse()
+			self.parsedCache.put(key, kind, result)
+		return result
 
 	def inputLineIter(self):
-		'''Yield input lines after applying conversion to each'''
-		for line in self.rawInputLineIter():
-			yield self.conversion(line)
+		'''Yield input lines after applying conversion to each
+
+		If the converted lines are cached already, the cached objects are
+		yielded themselves, so a conversion to mutable objects lets the
+		caller modify the cache.
+		'''
+		if self._linesCache is not None:
+			yield from self._linesCache
+		else:
+			for line in self.rawInputLineIter():
+				yield self.conversion(line)
 
 	def getInputLines(self):
-		'''Get inputLineIter() as list'''
-		return [line for line in self.inputLineIter()]
+		'''Get inputLineIter() as list
+
+		The converted lines are cached, so each call only returns a fresh
+		copy of the cached list, which the caller may modify. The converted
+		objects are not copied, though, but shared with the cache.
+		'''
+		if self._linesCache is None:
+			self._linesCache = self._cachedParse('lines',
+				lambda: [self.conversion(line) for line in self.rawInputLineIter()])
+		return self._linesCache.copy()
 
 	def getFirstInputLine(self):
-		'''Get first input line in case there is only one line'''
-		return self.getInputLines()[0]
+		'''Get first input line in case there is only one line
+
+		Like inputLineIter() this returns the cached object if the converted
+		lines are cached already.
+		'''
+		if self._linesCache is not None:
+			return self._linesCache[0]
+		return self.conversion(next(self.rawInputLineIter()))
 
 	def inputListsIter(self):
 		'''Split each input line at separators, apply conversion to its parts,
 		and yield it as list'''
-		for line in self.rawInputLineIter():
-			yield [self.conversion(e) for e in line.split(self.separator)]
+		if self._listsCache is not None:
+			for lineList in self._listsCache:
+				yield lineList.copy()
+		else:
+			for line in self.rawInputLineIter():
+				yield [self.conversion(e) for e in line.split(self.separator)]
 
 	def getInputLists(self):
-		'''Get inputListsIter() as list'''
-		return [lineList for lineList in self.inputListsIter()]
+		'''Get inputListsIter() as list
+
+		Like getInputLines() the result is cached and each call returns
+		a fresh copy, including copies of the line lists. The converted
+		objects within these lists are shared with the cache, though.
+		'''
+		if self._listsCache is None:
+			self._listsCache = self._cachedParse('lists',
+				lambda: [[self.conversion(e) for e in line.split(self.separator)]
+				         for line in self.rawInputLineIter()])
+		return [lineList.copy() for lineList in self._listsCache]
+
+	@staticmethod
+	def _parseNumbers(text, dtype, separator):
+		'''Parse numbers in text separated by separator into a flat array
+
+		Uses numpy if available, which parses without creating a Python object
+		per number. Otherwise an array.array is returned.
+		'''
+		if numpy is not None:
+			with warnings.catch_warnings():
+				# numpy only warns about unparsable text
+				warnings.simplefilter('error', DeprecationWarning)
+				try:
+					return numpy.fromstring(text, dtype=dtype, sep=' ' if separator is None else separator)
+				except DeprecationWarning:
+					raise ValueError("Cannot parse numbers from input")
+		conversion = float if dtype in 'fd' else int
+		return array.array(dtype, map(conversion, text.split(separator)))
+
+	def asArray(self, dtype='q', separator=None):
+		'''Parse all numbers of the input into a single flat array
+
+		dtype: array.array typecode like 'q' (int64) or 'd' (double), which is a
+		       valid numpy dtype as well
+		separator: separator of numbers within a line, None = whitespace
+
+		Returns a numpy array if numpy is available, otherwise an array.array.
+		Lines are joined and parsed in batches of ARRAY_BATCH_LINES lines.
+		'''
+		joinSeparator = ' ' if separator is None else separator
+		lines = self.rawInputLineIter()
+		batches = []
+		while True:
+			batch = list(itertools.islice(lines, ARRAY_BATCH_LINES))
+			if not batch:
+				break
+			batches.append(self._parseNumbers(joinSeparator.join(batch), dtype, separator))
+		if numpy is not None:
+			return numpy.concatenate(batches) if batches else numpy.empty(0, dtype=dtype)
+		result = array.array(dtype)
+		for batch in batches:
+			result.extend(batch)
+		return result
+
+	def asMatrix(self, dtype='q', separator=None):
+		'''Parse numbers of each line into a row of a two dimensional array
+
+		Parameters as for asArray(). Returns a numpy array, which requires all lines
+		to have the same number of numbers, or a list of array.array rows if numpy
+		is not available.
+		'''
+		rows = [self._parseNumbers(line, dtype, separator) for line in self.rawInputLineIter()]
+		if numpy is not None:
+			return numpy.vstack(rows)
+		return rows
+
+	def parseRecords(self, pattern, fieldTypes):
+		'''Find all records matching a regular expression and return their fields column-wise
+
+		pattern: regular expression (string or compiled) with one group per field
+		fieldTypes: one entry per group, either an array.array typecode like 'q' or 'd'
+		            to get the column as typed array, or a function like str to apply to
+		            each field of the column and get it as list
+
+		Returns a tuple of columns. The input is scanned with a single findall(), if it
+		is read entirely or memory-mapped. In streaming mode it is scanned line by line,
+		so records must not span lines then. Memory-mapped inputs are scanned as bytes,
+		so character classes like \\w and \\d only match ASCII characters then.
+		'''
+		regex = re.compile(pattern)
+		if self.memoryMapped:
+			# Scan the mapped bytes directly with an equivalent bytes pattern
+			bytesRegex = re.compile(regex.pattern.encode(INPUT_ENCODING), regex.flags & ~re.UNICODE)
+			matches = bytesRegex.findall(self.mappedInput, 0, self.mappedEnd)
+			columns = self._recordColumns(matches, len(fieldTypes))
+			columns = [column if isinstance(fieldType, str) else [field.decode(INPUT_ENCODING) for field in column]
+			           for column, fieldType in zip(columns, fieldTypes)]
+		elif self.streaming:
+			columns = [[] for fieldType in fieldTypes]
+			for line in self.rawInputLineIter():
+				for column, lineColumn in zip(columns, self._recordColumns(regex.findall(line), len(fieldTypes))):
+					column.extend(lineColumn)
+		else:
+			if self.input is None:
+				self._readInput()
+			columns = self._recordColumns(regex.findall(self.input), len(fieldTypes))
 
+		result = []
+		for column, fieldType in zip(columns, fieldTypes):
+			if isinstance(fieldType, str):
+				conversion = float if fieldType in 'fd' else int
+				result.append(array.array(fieldType, map(conversion, column)))
+			else:
+				result.append(list(map(fieldType, column)))
+		return tuple(result)
 
+	@staticmethod
+	def _recordColumns(matches, numFields):
+		'''Transpose result of findall() into columns'''
+		if numFields == 1:
+			# findall() returns the group itself instead of 1-tuples
+			return [matches]
+		if not matches:
+			return [[] for i in range(numFields)]
+		return list(zip(*matches))
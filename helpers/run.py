@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+'''
+Author: Björn Hendriks
+
+See http://adventofcode.com
+
+Run the solutions of several days of a year in parallel processes
+
+The days' modules are imported and their solve() functions called, so each
+day needs to provide loadInput() and solve() besides its __main__ code.
+
+Call this module from the repository's root folder, e.g.:
+
+    python -m helpers.run 2017 --days 1-25 --jobs 4
+
+Days known to run long are started first, so the total run time approaches
+the run time of the longest day if there are enough processes.
+'''
+
+
+import argparse
+import concurrent.futures
+import contextlib
+import importlib
+import io
+import os
+import sys
+import time
+import traceback
+
+
+# Root folder of this repository containing a folder per year
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Days with long run times sorted by descending expected run time
+LONG_RUNNING_DAYS = {
+	2017: [15, 22, 25, 21, 17],
+}
+
+
+def parseDays(daysText):
+	'''Parse days given like "1-5,7,9-11" into a sorted list of ints'''
+	days = set()
+	for part in daysText.split(','):
+		first, _, last = part.partition('-')
+		days.update(range(int(first), int(last or first) + 1))
+	return sorted(days)
+
+
+def scheduleOrder(year, days):
+	'''Sort days such that long running days come first, longest first'''
+	longDays = [d for d in LONG_RUNNING_DAYS.get(year, []) if d in days]
+	return longDays + [d for d in days if d not in longDays]
+
+
+def dayPath(year, day):
+	'''Path of the solution script of a day'''
+	return os.path.join(REPO_DIR, "{:04d}".format(year), "day{:02d}.py".format(day))
+
+
+def importDay(year, day):
+	'''Import and return the solution module of a day'''
+	yearDir = os.path.dirname(dayPath(year, day))
+	# The solutions import helpers from the repository's root and may import other days
+	for path in (REPO_DIR, yearDir):
+		if path not in sys.path:
+			sys.path.insert(0, path)
+	return importlib.import_module("day{:02d}".format(day))
+
+
+def runDay(year, day):
+	'''Load input of a day, solve it, and return day, results, output, and run time
+
+	The results are None if solving fails. Exceptions are not raised, but their
+	traceback is added to the output, which collects everything the day prints.
+	'''
+	output = io.StringIO()
+	results = None
+	start = time.perf_counter()
+	with contextlib.redirect_stdout(output):
+		try:
+			module = importDay(year, day)
+			results = tuple(module.solve(module.loadInput()))
+		except Exception:
+			traceback.print_exc(file=output)
+	return day, results, output.getvalue(), time.perf_counter() - start
+
+
+def runDays(year, days, jobs=None):
+	'''Run days in jobs parallel processes and return dict mapping day on results, output, and run time'''
+	runs = {}
+	with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+		futures = [executor.submit(runDay, year, day) for day in scheduleOrder(year, days)]
+		for future in concurrent.futures.as_completed(futures):
+			day, results, output, seconds = future.result()
+			print("day {:02d} finished after {:.2f} s".format(day, seconds))
+			runs[day] = (results, output, seconds)
+	return runs
+
+
+def main(args=None):
+	parser = argparse.ArgumentParser(description="Run Advent of Code solutions of several days in parallel")
+	parser.add_argument('year', type=int)
+	parser.add_argument('--days', default="1-25", help='days to run like "1-5,7" (default: 1-25)')
+	parser.add_argument('--jobs', type=int, default=None, help='number of processes (default: number of CPUs)')
+	parser.add_argument('--verbose', action='store_true', help="show everything the days print")
+	args = parser.parse_args(args)
+
+	start = time.perf_counter()
+	runs = runDays(args.year, parseDays(args.days), args.jobs)
+	totalSeconds = time.perf_counter() - start
+
+	print()
+	for day in sorted(runs):
+		results, output, seconds = runs[day]
+		if args.verbose or (results is None):
+			print("===== day {:02d} output =====".format(day))
+			print(output, end='')
+		if results is not None:
+			print("day {:02d} ({:7.2f} s): result1 = {}, result2 = {}".format(day, seconds, *results))
+	print("total time: {:.2f} s".format(totalSeconds))
+
+
+if __name__ == "__main__":
+	main()